@@ -5,14 +5,81 @@ App Store Crawler - Simplified version using iTunes RSS API
 import asyncio
 import logging
 import random
-from typing import List, Optional
-from datetime import datetime
+import time
+from typing import Any, AsyncIterator, Container, Dict, List, Optional, Set, Tuple
 
 from .base import BaseCrawler
 
 logger = logging.getLogger(__name__)
 
 
+# iTunes lookup records only change when the app ships an update, so cache them in-process
+LOOKUP_CACHE_TTL_SECONDS = 6 * 60 * 60
+LOOKUP_CACHE_MAX_SIZE = 1024
+_lookup_cache: Dict[Tuple[str, str], Tuple[float, dict]] = {}
+
+
+def get_cached_lookup(app_id: str, country: str) -> Optional[dict]:
+    """Return a cached iTunes lookup record, or None if missing/expired."""
+    key = (app_id, country)
+    entry = _lookup_cache.pop(key, None)
+    if entry is None:
+        return None
+    expires_at, app_info = entry
+    if time.monotonic() >= expires_at:
+        return None
+    # Re-insert at the end so eviction order is least recently used, not oldest stored
+    _lookup_cache[key] = entry
+    return app_info
+
+
+def cache_lookup(app_id: str, country: str, app_info: dict) -> None:
+    """Store an iTunes lookup record, evicting the least recently used entry when full."""
+    key = (app_id, country)
+    _lookup_cache.pop(key, None)
+    if len(_lookup_cache) >= LOOKUP_CACHE_MAX_SIZE:
+        _lookup_cache.pop(next(iter(_lookup_cache)), None)
+    _lookup_cache[key] = (time.monotonic() + LOOKUP_CACHE_TTL_SECONDS, app_info)
+
+
+def invalidate_cached_lookup(app_id: str) -> int:
+    """Drop cached lookup records for an app in every country. Returns entries removed."""
+    keys = [k for k in _lookup_cache if k[0] == app_id]
+    for key in keys:
+        del _lookup_cache[key]
+    return len(keys)
+
+
+# RSS storefronts tried after the requested country, in order: high-volume English-speaking
+# markets, then major European markets, then other significant markets
+RSS_PRIORITY_COUNTRIES = (
+    'us', 'gb', 'ca', 'au',
+    'de', 'fr', 'es', 'it', 'nl',
+    'jp', 'br', 'mx', 'in', 'kr',
+)
+
+# Storefronts crawled at once; kept low since every country walks several sort orders
+RSS_MAX_CONCURRENT_COUNTRIES = 3
+
+# Ratings arrive as "1".."5" labels (RSS) or numbers (browser); a dict lookup skips float() + try/except
+# for those, and anything else ("4.0", " 5", 4.5) goes through the general parse
+_STAR_RATINGS: Dict[Any, int] = {**{i: i for i in range(1, 6)}, **{str(i): i for i in range(1, 6)}}
+
+
+def parse_star_rating(value: Any) -> Optional[int]:
+    """Map a rating label or number to 1-5, or None if missing/invalid."""
+    if not isinstance(value, (str, int, float)):
+        return None
+    rating = _STAR_RATINGS.get(value)
+    if rating is not None:
+        return rating
+    try:
+        num_rating = float(value)
+    except ValueError:
+        return None
+    return int(num_rating) if 1 <= num_rating <= 5 else None
+
+
 def safe_get(obj, *keys, default=""):
     """Safely get nested dict values, returning default if any key is missing or type is wrong."""
     for key in keys:
@@ -22,6 +89,68 @@ def safe_get(obj, *keys, default=""):
     return obj if obj is not None else default
 
 
+def _parse_review_entries(
+    entries: List[Any],
+    country: str,
+    sort_by: str,
+    min_rating: Optional[int] = None,
+    max_rating: Optional[int] = None,
+    seen_ids: Optional[Container[str]] = None,
+    limit: Optional[int] = None,
+) -> List[dict]:
+    """
+    Convert raw RSS feed entries into review dicts, applying rating filters.
+
+    Pure function over plain data (no crawler state, returns plain dicts) so it
+    can be handed to an executor without pickling crawler objects.
+    Entries whose id is in seen_ids are skipped, and parsing stops as soon as
+    limit reviews have been accepted so no surplus dicts are built.
+    """
+    reviews = []
+    page_ids = set()
+
+    for entry in entries:
+        if limit is not None and len(reviews) >= limit:
+            break
+
+        # Skip non-dict entries and app info entry
+        if not isinstance(entry, dict) or "im:rating" not in entry:
+            continue
+
+        # Safely extract nested values
+        id_obj = entry.get("id", {})
+        review_id = id_obj.get("label", "") if isinstance(id_obj, dict) else ""
+        if not review_id or review_id in page_ids or (seen_ids is not None and review_id in seen_ids):
+            continue
+
+        # Parse rating - use None for missing/invalid to avoid biasing analytics
+        rating = parse_star_rating(safe_get(entry, "im:rating", "label"))
+
+        # Apply rating filters (skip reviews with null ratings if filters are set)
+        if min_rating and (rating is None or rating < min_rating):
+            continue
+        if max_rating and (rating is None or rating > max_rating):
+            continue
+
+        vote_label = safe_get(entry, "im:voteCount", "label", default="0")
+        vote_count = int(vote_label) if isinstance(vote_label, str) and vote_label.isdigit() else 0
+
+        page_ids.add(review_id)
+        reviews.append({
+            "id": review_id,
+            "title": safe_get(entry, "title", "label"),
+            "content": safe_get(entry, "content", "label"),
+            "rating": rating,
+            "author": safe_get(entry, "author", "name", "label"),
+            "version": safe_get(entry, "im:version", "label"),
+            "vote_count": vote_count,
+            "country": country,
+            "sort_source": sort_by,
+        })
+
+    return reviews
+
+
 class AppStoreCrawler(BaseCrawler):
     """Crawl App Store reviews using iTunes RSS API"""
 
@@ -42,180 +171,228 @@ class AppStoreCrawler(BaseCrawler):
         Note: iTunes RSS API is limited to ~500 reviews per country/sort.
         For more reviews, browser scraping is needed.
         """
-        all_reviews = {}
-        # iTunes RSS allows pages 1-10 (500 reviews max per sort)
-        max_pages = 10
+        return [
+            review async for review in self.iter_reviews(
+                app_id=app_id,
+                country=country,
+                max_reviews=max_reviews,
+                min_rating=min_rating,
+                max_rating=max_rating,
+            )
+        ]
+
+    async def iter_reviews(
+        self,
+        app_id: str,
+        country: str = "us",
+        max_reviews: int = 1000,
+        min_rating: Optional[int] = None,
+        max_rating: Optional[int] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Stream reviews from the iTunes RSS API as each feed page is parsed.
+
+        Same crawl as crawl_reviews, but only review ids are kept for dedup, so
+        callers that persist as they go never hold every review dict at once.
+        Yields at most max_reviews reviews.
+        """
+        seen_ids: Set[str] = set()
 
         logger.info(f"Starting RSS review crawl for app {app_id} in {country}, max {max_reviews} reviews")
 
         # Try multiple countries for RSS to maximize coverage
-        countries_to_try = [country]
+        countries_to_try = (country,)
         if max_reviews > 500:
-            # Tier 1: High-volume English-speaking markets
-            tier1 = ['us', 'gb', 'ca', 'au']
-            # Tier 2: Major European markets
-            tier2 = ['de', 'fr', 'es', 'it', 'nl']
-            # Tier 3: Other significant markets
-            tier3 = ['jp', 'br', 'mx', 'in', 'kr']
-
-            all_countries = tier1 + tier2 + tier3
-            countries_to_try = [country] + [c for c in all_countries if c != country]
-
-            # Scale countries based on max_reviews target
-            if max_reviews >= 3000:
-                countries_to_try = countries_to_try[:10]  # 10 countries for 3000+ target
-            elif max_reviews >= 1500:
-                countries_to_try = countries_to_try[:6]   # 6 countries for 1500+ target
-            else:
-                countries_to_try = countries_to_try[:4]   # 4 countries for smaller targets
-
-        for current_country in countries_to_try:
-            if len(all_reviews) >= max_reviews:
-                break
+            # Scale countries based on max_reviews target: 10 for 3000+, 6 for 1500+, else 4
+            country_limit = 10 if max_reviews >= 3000 else 6 if max_reviews >= 1500 else 4
+            # Always start with the requested country, then add other priority countries
+            countries_to_try = tuple(dict.fromkeys((country, *RSS_PRIORITY_COUNTRIES)))[:country_limit]
+
+        # Storefronts are independent feeds, so a few are crawled at once; each country
+        # queues its parsed pages and None once it is finished
+        pages: asyncio.Queue = asyncio.Queue()
+        country_sem = asyncio.Semaphore(RSS_MAX_CONCURRENT_COUNTRIES)
+
+        async def crawl_country(current_country: str) -> None:
+            try:
+                async with country_sem:
+                    async for page_reviews in self._iter_country_pages(
+                        app_id, current_country, max_reviews, min_rating, max_rating, seen_ids
+                    ):
+                        pages.put_nowait(page_reviews)
+            except Exception as e:
+                # One failing storefront shouldn't end the others
+                logger.error(f"RSS crawl failed for {current_country}: {e}")
+            finally:
+                pages.put_nowait(None)
+
+        tasks = [asyncio.create_task(crawl_country(c)) for c in countries_to_try]
+        countries_running = len(tasks)
+        try:
+            while countries_running and len(seen_ids) < max_reviews:
+                page_reviews = await pages.get()
+                if page_reviews is None:
+                    countries_running -= 1
+                    continue
+                # Pages from concurrent countries were parsed against an older seen_ids
+                for review in page_reviews:
+                    if len(seen_ids) >= max_reviews:
+                        break
+                    if review["id"] in seen_ids:
+                        continue
+                    seen_ids.add(review["id"])
+                    yield review
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-            for sort_by in self.SORT_OPTIONS:
-                if len(all_reviews) >= max_reviews:
-                    break
+        logger.info(f"RSS review crawl complete: {len(seen_ids)} unique reviews collected from {len(countries_to_try)} countries")
 
-                consecutive_empty = 0
-                pages_crawled = 0
+    async def _iter_country_pages(
+        self,
+        app_id: str,
+        country: str,
+        max_reviews: int,
+        min_rating: Optional[int],
+        max_rating: Optional[int],
+        seen_ids: Set[str],
+    ) -> AsyncIterator[List[dict]]:
+        """
+        Yield parsed review pages for one storefront, across every sort order.
 
-                for page in range(1, max_pages + 1):
-                    if len(all_reviews) >= max_reviews:
-                        break
+        seen_ids is only read here (iter_reviews owns it), to skip reviews already
+        accepted and to stop once max_reviews is reached.
+        """
+        # iTunes RSS allows pages 1-10 (500 reviews max per sort)
+        max_pages = 10
+        storefront_empty = False
 
-                    url = f"https://itunes.apple.com/{current_country}/rss/customerreviews/page={page}/id={app_id}/sortBy={sort_by}/json"
+        for sort_by in self.SORT_OPTIONS:
+            if len(seen_ids) >= max_reviews:
+                break
 
-                    data = await self.fetch_json(url)
+            consecutive_empty = 0
+            pages_crawled = 0
 
-                    # Handle various error cases
-                    if not data:
-                        consecutive_empty += 1
-                        logger.debug(f"Empty response for {sort_by} page {page}")
-                        if consecutive_empty >= 5:  # Increased threshold
-                            logger.info(f"Stopping {sort_by} after {consecutive_empty} consecutive empty pages")
-                            break
-                        continue
+            for page in range(1, max_pages + 1):
+                if len(seen_ids) >= max_reviews:
+                    break
 
-                    # Check for non-dict responses (Apple sometimes returns XML errors or strings)
-                    if not isinstance(data, dict):
-                        logger.warning(f"Received non-dict response for {sort_by} page {page}: {type(data).__name__}")
-                        consecutive_empty += 1
-                        if consecutive_empty >= 5:
-                            break
-                        continue
+                entries = await self._fetch_review_entries(app_id, country, sort_by, page)
 
-                    feed = data.get("feed", {})
-                    if not isinstance(feed, dict):
-                        logger.warning(f"Feed is not a dict for {sort_by} page {page}: {type(feed).__name__}")
-                        consecutive_empty += 1
-                        if consecutive_empty >= 5:
-                            break
-                        continue
+                if not entries:
+                    # Feed answered but has no reviews at all for this storefront -
+                    # the other sort orders will be empty too, so skip them
+                    if entries is not None and page == 1 and sort_by == self.SORT_OPTIONS[0]:
+                        storefront_empty = True
+                        break
+                    consecutive_empty += 1
+                    if consecutive_empty >= 5:  # Increased threshold
+                        logger.info(f"Stopping {sort_by} after {consecutive_empty} consecutive empty pages")
+                        break
+                    continue
 
-                    entries = feed.get("entry", [])
-                    # Ensure entries is a list
-                    if not isinstance(entries, list):
-                        entries = [entries] if entries else []
-
-                    if not entries:
-                        consecutive_empty += 1
-                        logger.debug(f"No entries in {sort_by} page {page}")
-                        if consecutive_empty >= 5:  # Increased threshold
-                            logger.info(f"Stopping {sort_by} after {consecutive_empty} consecutive empty pages")
-                            break
-                        continue
+                consecutive_empty = 0
+                pages_crawled += 1
+
+                # Parse off the event loop so concurrent crawls keep making progress. The thread
+                # only runs membership checks on the live seen_ids (each atomic against the
+                # loop's adds), so no per-page copy; iter_reviews re-checks what it yields
+                page_reviews = await asyncio.to_thread(
+                    _parse_review_entries,
+                    entries,
+                    country=country,
+                    sort_by=sort_by,
+                    min_rating=min_rating,
+                    max_rating=max_rating,
+                    seen_ids=seen_ids,
+                    limit=max_reviews - len(seen_ids),
+                )
+                del entries
+
+                if page_reviews:
+                    yield page_reviews
+
+                logger.debug(f"{country}/{sort_by} page {page}: {len(page_reviews)} new reviews (total: {len(seen_ids)})")
+
+                # Small delay between requests
+                await asyncio.sleep(random.uniform(0.3, 0.8))
+
+            if storefront_empty:
+                logger.info(f"No RSS reviews in {country} storefront, skipping remaining sort orders")
+                break
 
-                    consecutive_empty = 0
-                    pages_crawled += 1
-                    new_reviews_this_page = 0
-
-                    for entry in entries:
-                        # Skip non-dict entries and app info entry
-                        if not isinstance(entry, dict) or "im:rating" not in entry:
-                            continue
-
-                        # Safely extract nested values
-                        id_obj = entry.get("id", {})
-                        review_id = id_obj.get("label", "") if isinstance(id_obj, dict) else ""
-                        if not review_id or review_id in all_reviews:
-                            continue
-
-                        # Parse rating - use None for missing/invalid to avoid biasing analytics
-                        try:
-                            rating_label = safe_get(entry, "im:rating", "label")
-                            if rating_label:
-                                rating = int(rating_label)
-                                if rating < 1 or rating > 5:
-                                    rating = None
-                            else:
-                                rating = None
-                        except (ValueError, TypeError):
-                            rating = None
-
-                        # Apply rating filters (skip reviews with null ratings if filters are set)
-                        if min_rating and (rating is None or rating < min_rating):
-                            continue
-                        if max_rating and (rating is None or rating > max_rating):
-                            continue
-
-                        try:
-                            vote_label = safe_get(entry, "im:voteCount", "label", default="0")
-                            vote_count = int(vote_label) if vote_label else 0
-                        except (ValueError, TypeError):
-                            vote_count = 0
-
-                        review = {
-                            "id": review_id,
-                            "title": safe_get(entry, "title", "label"),
-                            "content": safe_get(entry, "content", "label"),
-                            "rating": rating,
-                            "author": safe_get(entry, "author", "name", "label"),
-                            "version": safe_get(entry, "im:version", "label"),
-                            "vote_count": vote_count,
-                            "country": current_country,
-                            "sort_source": sort_by,
-                        }
-                        all_reviews[review_id] = review
-                        new_reviews_this_page += 1
-
-                    logger.debug(f"{current_country}/{sort_by} page {page}: {new_reviews_this_page} new reviews (total: {len(all_reviews)})")
-
-                    # Small delay between requests
-                    await asyncio.sleep(random.uniform(0.3, 0.8))
-
-                logger.info(f"Completed {current_country}/{sort_by}: crawled {pages_crawled} pages, total unique: {len(all_reviews)}")
-
-                # Delay between sort types
-                await asyncio.sleep(random.uniform(0.5, 1.0))
-
-            # Extra delay between countries for large scrapes to avoid rate limiting
-            if len(countries_to_try) > 4:
-                await asyncio.sleep(random.uniform(1.0, 2.0))
-
-        logger.info(f"RSS review crawl complete: {len(all_reviews)} unique reviews collected from {len(countries_to_try)} countries")
-        return list(all_reviews.values())[:max_reviews]
+            logger.info(f"Completed {country}/{sort_by}: crawled {pages_crawled} pages, total unique: {len(seen_ids)}")
 
-    async def crawl_whats_new(
+            # Delay between sort types
+            await asyncio.sleep(random.uniform(0.5, 1.0))
+
+    async def _fetch_review_entries(
         self,
         app_id: str,
-        country: str = "us",
-        max_versions: int = 50,
-    ) -> List[dict]:
+        country: str,
+        sort_by: str,
+        page: int,
+    ) -> Optional[List[Any]]:
         """
-        Get version history from iTunes lookup API.
-        Note: iTunes API only returns current version info.
+        Fetch one page of the iTunes customer-reviews JSON feed.
+
+        Returns the feed entries (an empty list when the feed has none), or None
+        when the response was missing or malformed.
         """
+        url = f"https://itunes.apple.com/{country}/rss/customerreviews/page={page}/id={app_id}/sortBy={sort_by}/json"
+
+        data = await self.fetch_json(url)
+
+        # Handle various error cases
+        if not data:
+            logger.debug(f"Empty response for {sort_by} page {page}")
+            return None
+
+        # Check for non-dict responses (Apple sometimes returns XML errors or strings)
+        if not isinstance(data, dict):
+            logger.warning(f"Received non-dict response for {sort_by} page {page}: {type(data).__name__}")
+            return None
+
+        feed = data.get("feed", {})
+        if not isinstance(feed, dict):
+            logger.warning(f"Feed is not a dict for {sort_by} page {page}: {type(feed).__name__}")
+            return None
+
+        entries = feed.get("entry", [])
+        # Ensure entries is a list
+        if not isinstance(entries, list):
+            entries = [entries] if entries else []
+
+        if not entries:
+            logger.debug(f"No entries in {sort_by} page {page}")
+
+        return entries
+
+    async def _lookup_app(self, app_id: str, country: str = "us") -> Optional[dict]:
+        """Fetch the iTunes lookup record for an app (shared by version + privacy info)."""
+        cached = get_cached_lookup(app_id, country)
+        if cached is not None:
+            logger.debug(f"Lookup cache hit for {app_id}/{country}")
+            return cached
+
         url = f"https://itunes.apple.com/lookup?id={app_id}&country={country}"
         data = await self.fetch_json(url)
 
         if not data or not isinstance(data, dict) or not data.get("results"):
-            return []
+            return None
 
         app_info = data["results"][0]
         if not isinstance(app_info, dict):
-            return []
+            return None
 
+        cache_lookup(app_id, country, app_info)
+        return app_info
+
+    @staticmethod
+    def _whats_new_from_lookup(app_info: dict) -> List[dict]:
+        """Build the version entry list from an iTunes lookup record."""
         return [{
             "version": app_info.get("version", ""),
             "release_date": app_info.get("currentVersionReleaseDate", ""),
@@ -223,6 +400,33 @@ class AppStoreCrawler(BaseCrawler):
             "size_bytes": app_info.get("fileSizeBytes", 0),
         }]
 
+    @staticmethod
+    def _privacy_from_lookup(app_info: dict) -> List[dict]:
+        """Build the privacy label list from an iTunes lookup record."""
+        # Basic privacy info from API
+        return [{
+            "category": "App Information",
+            "data_types": [],
+            "purposes": [],
+            "privacy_policy_url": app_info.get("sellerUrl", ""),
+        }]
+
+    async def crawl_whats_new(
+        self,
+        app_id: str,
+        country: str = "us",
+        max_versions: int = 50,
+    ) -> List[dict]:
+        """
+        Get version history from iTunes lookup API.
+        Note: iTunes API only returns current version info.
+        """
+        app_info = await self._lookup_app(app_id, country)
+        if not app_info:
+            return []
+
+        return self._whats_new_from_lookup(app_info)
+
     async def crawl_privacy_labels(
         self,
         app_id: str,
@@ -232,20 +436,39 @@ class AppStoreCrawler(BaseCrawler):
         Get privacy labels from iTunes lookup API.
         Note: Full privacy labels require web scraping which isn't reliable.
         """
-        url = f"https://itunes.apple.com/lookup?id={app_id}&country={country}"
-        data = await self.fetch_json(url)
-
-        if not data or not isinstance(data, dict) or not data.get("results"):
+        app_info = await self._lookup_app(app_id, country)
+        if not app_info:
             return []
 
-        app_info = data["results"][0]
-        if not isinstance(app_info, dict):
-            return []
+        return self._privacy_from_lookup(app_info)
 
-        # Basic privacy info from API
-        return [{
-            "category": "App Information",
-            "data_types": [],
-            "purposes": [],
-            "privacy_policy_url": app_info.get("sellerUrl", ""),
-        }]
+    async def crawl_all(
+        self,
+        app_id: str,
+        country: str = "us",
+        max_reviews: int = 1000,
+        min_rating: Optional[int] = None,
+        max_rating: Optional[int] = None,
+    ) -> dict:
+        """
+        Crawl reviews, version info and privacy labels for an app concurrently.
+
+        Version info and privacy labels come from the same lookup record, so it is
+        fetched once and overlapped with the (much longer) review crawl.
+        """
+        reviews, app_info = await asyncio.gather(
+            self.crawl_reviews(
+                app_id=app_id,
+                country=country,
+                max_reviews=max_reviews,
+                min_rating=min_rating,
+                max_rating=max_rating,
+            ),
+            self._lookup_app(app_id, country),
+        )
+
+        return {
+            "reviews": reviews,
+            "versions": self._whats_new_from_lookup(app_info) if app_info else [],
+            "privacy_labels": self._privacy_from_lookup(app_info) if app_info else [],
+        }
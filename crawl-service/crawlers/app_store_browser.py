@@ -4,52 +4,722 @@ Scrapes the actual App Store web pages instead of the limited RSS API
 """
 
 import asyncio
-import hashlib
 import logging
+import random
 import re
+import time
 from contextlib import asynccontextmanager
-from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional, Dict, Any, Tuple
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+import httpx
 from playwright.async_api import (
     async_playwright,
+    APIRequestContext,
     Page,
     Browser,
     BrowserContext,
     TimeoutError as PlaywrightTimeout,
 )
 
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+from .app_store import cache_lookup, get_cached_lookup
+from utils.dedup import review_key
+from utils.rate_limiter import RateLimiter
+
 logger = logging.getLogger(__name__)
 
+# Review cards on the web App Store; used to detect when a scroll has loaded more
+REVIEW_CARD_SELECTOR = 'article[aria-labelledby^="review-"], .we-customer-review'
+
+# JSON reviews endpoint the web App Store itself calls (paginated by offset/limit)
+AMP_REVIEWS_URL = "https://amp-api.apps.apple.com/v1/catalog/{country}/apps/{app_id}/reviews"
+
+# Offset in an amp-api "next" cursor, e.g. /v1/catalog/us/apps/123/reviews?offset=20
+AMP_NEXT_OFFSET_RE = re.compile(r'[?&]offset=(\d+)')
+
+# How long a bearer token captured from the storefront is reused before capturing a fresh one
+AMP_TOKEN_TTL = 30 * 60
+
+# Cookies/localStorage from the first storefront page that loads, seeded into later
+# contexts (across crawler instances) so they skip Apple's first-visit initialisation
+STORAGE_STATE_TTL_SECONDS = 60 * 60
+_storage_state_cache: Optional[Tuple[float, dict]] = None
+
+
+def get_cached_storage_state() -> Optional[dict]:
+    """Return the seeded storefront storage state, or None if missing/expired."""
+    global _storage_state_cache
+    if _storage_state_cache is None:
+        return None
+    expires_at, state = _storage_state_cache
+    if time.monotonic() >= expires_at:
+        _storage_state_cache = None
+        return None
+    return state
+
+
+def cache_storage_state(state: dict) -> None:
+    """Store a storefront storage state for STORAGE_STATE_TTL_SECONDS."""
+    global _storage_state_cache
+    _storage_state_cache = (time.monotonic() + STORAGE_STATE_TTL_SECONDS, state)
+
+
+# Sections the version-history and privacy extractors read; waited on instead of fixed sleeps
+VERSION_HISTORY_SELECTOR = 'a[href*="version-history"], [class*="version"]'
+PRIVACY_SECTION_SELECTOR = '[class*="privacy"], [class*="Privacy"]'
+
+# "See All Reviews" entry points on the app page, tried as one locator
+SEE_ALL_REVIEWS_SELECTOR = ', '.join((
+    'a:has-text("See All"):visible',
+    'a:has-text("Ratings and Reviews"):visible',
+    'a[href*="see-all=reviews"]:visible',
+    '.we-truncate__button:visible',
+))
+
+# High-volume storefronts tried after the requested country, in order
+PRIORITY_COUNTRIES = ('us', 'gb', 'ca', 'au', 'de', 'fr', 'jp', 'in', 'br', 'mx', 'es', 'it', 'nl', 'kr', 'ru', 'sg')
+
+# Apple throttles with 429 (and sheds load with 503); those are worth retrying
+RETRYABLE_STATUSES = frozenset({429, 503})
+
+# Scroll steps per country listing, both Python-driven and chained in-page
+MAX_SCROLL_ATTEMPTS = 25
+
+# Wall-clock budget per country, scaled with the review target, so one stalled page
+# can't hold a concurrency slot for the rest of the crawl
+COUNTRY_BUDGET_MIN_SECONDS = 30
+COUNTRY_BUDGET_SECONDS_PER_REVIEW = 0.05
+
+# Scroll steps between forced V8 collections (window.gc, exposed via --js-flags)
+GC_EVERY_SCROLLS = 10
+
+# Page-side helpers, installed once per context via add_init_script so each call
+# from Python is a short evaluate instead of re-sending and re-compiling the source.
+
+# Multi-strategy review extractor for Apple's Svelte-based DOM
+_EXTRACT_REVIEWS_JS = r"""
+// Built once per document rather than once per card
+const REVIEW_STARS_RE = /(\d+)\s*Stars?/i;
+const REVIEW_DIGITS_RE = /(\d+)/;
+// Rating elements tried in order with the label pattern each one uses
+const RATING_LOOKUPS = [
+    ['ol.stars[aria-label]', REVIEW_STARS_RE],
+    ['[aria-label*="star" i]', REVIEW_STARS_RE],
+    ['figure[aria-label*="star" i], figure[role="img"][aria-label]', REVIEW_DIGITS_RE],
+];
+const REVIEW_ID_RE = /review-(\d+)/;
+
+window.__extractReviews = ({ minRating = null, maxRating = null } = {}) => {
+    const results = [];
+    // Cards already returned from this document; lives on window so each call only
+    // returns the delta since the last one (a navigation starts a fresh set).
+    // Holds 53-bit cyrb53 hashes of the content prefix rather than the strings.
+    const seenContent = (window.__seen ||= new Set());
+    // Card elements already turned into a result (or deduped/filtered); skipped before any
+    // text work, so each call only pays for cards added since the previous one
+    const processed = (window.__processedCards ||= new WeakSet());
+    const cyrb53 = (str) => {
+        let h1 = 0xdeadbeef, h2 = 0x41c6ce57;
+        for (let i = 0, ch; i < str.length; i++) {
+            ch = str.charCodeAt(i);
+            h1 = Math.imul(h1 ^ ch, 2654435761);
+            h2 = Math.imul(h2 ^ ch, 1597334677);
+        }
+        h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507);
+        h1 ^= Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+        h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507);
+        h2 ^= Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+        return 4294967296 * (2097151 & h2) + (h1 >>> 0);
+    };
+
+
+    // Strategy 1: Modern Apple DOM - review containers by common patterns
+    let reviewCards = Array.from(document.querySelectorAll('[class*="review"], [class*="Review"], [data-test*="review"]'));
+    // Processed cards still count towards picking a strategy, without re-reading their text
+    reviewCards = reviewCards.filter(el => processed.has(el) || (el.textContent.length > 50 && el.querySelector('*')));
+
+    // Strategy 2: Original selectors - article elements with review ID
+    if (reviewCards.length === 0) {
+        reviewCards = Array.from(document.querySelectorAll('article[aria-labelledby^="review-"]'));
+    }
+
+    // Strategy 3: Star rating elements - traverse up
+    if (reviewCards.length === 0) {
+        const starEls = document.querySelectorAll('[aria-label*="Star"], [aria-label*="star"], figure[role="img"]');
+        const seen = new Set();
+        starEls.forEach(star => {
+            let parent = star.closest('article, section, [class*="review"]');
+            if (!parent) { parent = star.parentElement; for (let i=0;i<5&&parent;i++){if(parent.textContent.length>80)break;parent=parent.parentElement;} }
+            if (reviewCards.length >= 200) return;
+            if (parent && !seen.has(parent) && parent.textContent.length > 50) { seen.add(parent); reviewCards.push(parent); }
+        });
+    }
+
+    // Strategy 4: elements with review-header class
+    if (reviewCards.length === 0) {
+        const reviewHeaders = document.querySelectorAll('.review-header');
+        reviewHeaders.forEach(header => {
+            const article = header.closest('article');
+            if (article && !reviewCards.includes(article)) {
+                reviewCards.push(article);
+            }
+        });
+    }
+
+    // Strategy 5: ol.stars with aria-label and traverse up
+    if (reviewCards.length === 0) {
+        const starLists = document.querySelectorAll('ol.stars[aria-label*="Star"]');
+        starLists.forEach(stars => {
+            const article = stars.closest('article');
+            if (article && !reviewCards.includes(article)) {
+                reviewCards.push(article);
+            }
+        });
+    }
+
+    reviewCards = reviewCards.filter(card => !processed.has(card));
+
+    const titleSels = ['h3.title .multiline-clamp__text', 'h3[id^="review-"] .multiline-clamp__text', 'h3.title', 'h3[id^="review-"]', '[class*="title"] h3', 'h3'];
+    const authorSels = ['p.author', '.author', '[class*="author"]', '[class*="Author"]'];
+
+    // Cards on a page share one layout, so probe the first card for the selector that
+    // works and try only that one per card, falling back to the full list on a miss
+    const pickSel = (sels) => {
+        const probe = reviewCards[0];
+        if (!probe) return null;
+        for (const sel of sels) {
+            const el = probe.querySelector(sel);
+            if (el && el.textContent.trim().length > 0) return sel;
+        }
+        return null;
+    };
+    const firstText = (card, winner, sels) => {
+        if (winner) {
+            const el = card.querySelector(winner);
+            const text = el ? el.textContent.trim() : '';
+            if (text.length > 0) return text;
+        }
+        for (const sel of sels) {
+            if (sel === winner) continue;
+            const el = card.querySelector(sel);
+            if (el && el.textContent.trim().length > 0) return el.textContent.trim();
+        }
+        return '';
+    };
+    const titleSel = pickSel(titleSels);
+    const authorSel = pickSel(authorSels);
+
+    // Process each review card
+    reviewCards.forEach((card, index) => {
+        try {
+            // Extract title
+            const title = firstText(card, titleSel, titleSels);
+
+            // Extract rating - labelled elements in priority order ("4 Stars" lists and
+            // spans, then a star figure whose label may be just the digit); usually one lookup
+            let rating = 0;
+            for (const [sel, re] of RATING_LOOKUPS) {
+                const ratingEl = card.querySelector(sel);
+                const match = ratingEl && (ratingEl.getAttribute('aria-label') || '').match(re);
+                if (match) {
+                    rating = parseInt(match[1]);
+                    break;
+                }
+            }
+
+            // Fallback: Count filled star elements
+            if (rating === 0) {
+                const starItems = card.querySelectorAll('ol.stars li.star, [class*="star-filled"], [class*="StarFilled"]');
+                if (starItems.length > 0 && starItems.length <= 5) {
+                    rating = starItems.length;
+                }
+            }
+
+            // Extract date - try multiple selectors; ship one value, the machine-readable
+            // datetime attribute when present, else the displayed text
+            let date = '';
+            const timeEl = card.querySelector('time.date, time[datetime], [class*="date"] time, time');
+            if (timeEl) {
+                date = timeEl.getAttribute('datetime') || timeEl.textContent.trim();
+            }
+
+            // Extract author
+            const author = firstText(card, authorSel, authorSels);
+
+            // Extract content - try multiple selectors
+            let content = '';
+            const contentEl = card.querySelector('p[data-testid="truncate-text"], div.content p.content, div.content p, [class*="content"] p, [class*="body"] p');
+            if (contentEl) {
+                content = contentEl.textContent.trim();
+            }
+
+            // Fallback: get text from content div
+            if (!content) {
+                const contentDiv = card.querySelector('div.content, [class*="content"], [class*="body"]');
+                if (contentDiv) {
+                    content = contentDiv.textContent.trim();
+                }
+            }
+
+            // Skip if no meaningful content (yet - the card is retried on the next call)
+            if (!content || content.length < 10) return;
+            processed.add(card);
+
+            // Dedupe by content, within this call and across earlier calls
+            const contentKey = cyrb53(content.substring(0, 100));
+            if (seenContent.has(contentKey)) return;
+            seenContent.add(contentKey);
+
+            // Get review ID from aria-labelledby if available
+            const ariaLabelledBy = card.getAttribute('aria-labelledby') || '';
+            const reviewIdMatch = ariaLabelledBy.match(REVIEW_ID_RE);
+            // Otherwise reuse the content hash: stable across scrolls, no clock or string building per card
+            const reviewId = reviewIdMatch ? reviewIdMatch[1] : 'browser_' + contentKey.toString(36);
+
+            const validRating = (rating >= 1 && rating <= 5) ? rating : null;
+            // Same rating filter as ReviewCollection.merge (a missing rating counts as 0), applied
+            // here so filtered-out reviews never cross the CDP pipe; they stay in seenContent
+            if (minRating && (validRating || 0) < minRating) return;
+            if (maxRating && (validRating || 0) > maxRating) return;
+            results.push({
+                id: reviewId,
+                date: date,
+                author: author || 'Anonymous',
+                content: content.substring(0, 5000),
+                rating: validRating,
+                title: title,
+            });
+        } catch (e) {
+            console.error('Error extracting review:', e);
+        }
+    });
+
+    return results;
+};
+"""
+
+# Clicks a visible "Show More" reviews button when the listing has one (one click drives
+# one page fetch), otherwise brings the last review card into view; before any card has
+# rendered it scrolls the reviews modal, falling back to the page itself. One call.
+# Returns the review card count from before loading more.
+_SCROLL_REVIEWS_JS = """
+const SHOW_MORE_RE = /^\\s*(show|see|load) more( reviews)?\\s*$/i;
+
+window.__scrollForMoreReviews = (cardSelector) => {
+    const cardEls = document.querySelectorAll(cardSelector);
+    const cards = cardEls.length;
+
+    // Per-card "more" buttons only expand a review body, so skip anything inside a card
+    const showMore = Array.from(document.querySelectorAll('button')).find(btn =>
+        btn.offsetParent !== null &&
+        !btn.closest(cardSelector) &&
+        (btn.classList.contains('we-button--show-more') ||
+         SHOW_MORE_RE.test(btn.textContent))
+    );
+    if (showMore) {
+        showMore.click();
+        return { cards, scrolled: 'show-more' };
+    }
+
+    // Jump the last card to the top of its scroller: this scrolls every enclosing
+    // container (modal or page) at once and exposes the lazy loader's sentinel below
+    // it, with no smooth-scroll animation to wait out
+    if (cards) {
+        cardEls[cards - 1].scrollIntoView({ block: 'start', behavior: 'instant' });
+        return { cards, scrolled: 'last-card' };
+    }
+
+    // Common modal/dialog selectors for Apple's App Store
+    const modalSelectors = [
+        // Dialog/modal containers
+        '[role="dialog"]',
+        '[role="dialog"] [class*="scroll"]',
+        '[aria-modal="true"]',
+        // Apple-specific modal content areas
+        '.modal__content',
+        '.we-modal__content',
+        '[class*="modal"] [class*="content"]',
+        '[class*="dialog"] [class*="content"]',
+        // Scrollable containers within modals
+        '[class*="review"] [class*="scroll"]',
+        '[class*="reviews-list"]',
+        // Generic scrollable containers that might contain reviews
+        '[class*="infinite-scroll"]',
+        '[class*="virtual-scroll"]',
+    ];
+
+    for (const selector of modalSelectors) {
+        const containers = document.querySelectorAll(selector);
+        for (const container of containers) {
+            // Check if this container is scrollable
+            const isScrollable = container.scrollHeight > container.clientHeight;
+            const hasReviews = container.querySelector('article[aria-labelledby^="review-"]') !== null ||
+                             container.querySelector('.review-header') !== null;
+
+            if (isScrollable && (hasReviews || container.closest('[role="dialog"]'))) {
+                // Jump this container to its bottom, where the lazy-load trigger lives
+                container.scrollTop = container.scrollHeight;
+                return { cards, scrolled: selector };
+            }
+        }
+    }
+
+    // Fallback: scroll the main page (for non-modal review pages) straight to the
+    // bottom, where the lazy-load trigger lives
+    window.scrollTo(0, document.body.scrollHeight);
+    return { cards, scrolled: 'page' };
+};
+"""
+
+# Resolves true as soon as more review cards are attached than `before`, false on timeout.
+# A MutationObserver lets the scroll loop run at network speed instead of sleeping.
+_WAIT_FOR_REVIEWS_JS = """
+window.__waitForNewReviews = (selector, before, timeoutMs) => new Promise(resolve => {
+    const count = () => document.querySelectorAll(selector).length;
+    if (count() > before) {
+        resolve(true);
+        return;
+    }
+
+    let timer = null;
+    const observer = new MutationObserver(() => {
+        if (count() > before) {
+            clearTimeout(timer);
+            observer.disconnect();
+            resolve(true);
+        }
+    });
+    observer.observe(document.body, { childList: true, subtree: true });
+    timer = setTimeout(() => {
+        observer.disconnect();
+        resolve(false);
+    }, timeoutMs);
+});
+"""
+
+# One scroll-loop step in a single evaluate: scroll and wait for new cards, so each
+# iteration costs one CDP round-trip instead of two.
+_SCROLL_AND_WAIT_JS = """
+window.__scrollAndWait = async (selector, timeoutMs) => {
+    const started = performance.now();
+    const { cards, scrolled } = window.__scrollForMoreReviews(selector);
+    const landed = await window.__waitForNewReviews(selector, cards, timeoutMs);
+    const waitedMs = Math.round(performance.now() - started);
+    // A running review stream pushes the new cards now rather than after its coalescing delay
+    if (landed && window.__reviewStream) window.__flushReviewStream();
+    return { scrolled, landed, waitedMs };
+};
+"""
+
+# Pushes newly rendered reviews to Python through the __pushReviews binding (exposed per
+# context by _create_page) instead of waiting for the next scroll step to poll for them.
+# Mutation bursts are coalesced so the extractor runs at most every 100ms; returns the
+# number of reviews pushed straight away for cards that had already rendered.
+_STREAM_REVIEWS_JS = """
+window.__streamReviews = (filters = {}) => {
+    const push = () => {
+        const reviews = window.__extractReviews(filters);
+        // One string crosses the binding instead of a per-field serialized object graph
+        if (reviews.length) window.__pushReviews(JSON.stringify(reviews));
+        return reviews.length;
+    };
+    window.__stopReviewStream();
+    let pending = null;
+    window.__flushReviewStream = () => {
+        clearTimeout(pending);
+        pending = null;
+        return push();
+    };
+    window.__reviewStream = new MutationObserver(() => {
+        pending ||= setTimeout(window.__flushReviewStream, 100);
+    });
+    window.__reviewStream.observe(document.body, { childList: true, subtree: true });
+    return push();
+};
+
+window.__stopReviewStream = () => {
+    if (window.__reviewStream) window.__reviewStream.disconnect();
+    window.__reviewStream = null;
+};
+"""
+
+# Keeps the listing loading between scroll steps without a Python round-trip: as soon as
+# new review cards land, the last one gets an IntersectionObserver and, once it is in or
+# within 1000px below the viewport (the loader's sentinel is close), the next scroll fires
+# from inside the page. Capped at maxSteps scrolls and stopped by __stopAutoScroll; scroll
+# steps from Python still run, so a scroll that loaded nothing is retried from there.
+_AUTO_SCROLL_JS = """
+window.__startAutoScroll = (selector, maxSteps) => {
+    window.__stopAutoScroll();
+    let steps = 0, sentinel = null, pending = null;
+    const io = new IntersectionObserver(entries => {
+        if (steps >= maxSteps || !entries.some(entry => entry.isIntersecting)) return;
+        steps++;
+        window.__scrollForMoreReviews(selector);
+    }, { rootMargin: '0px 0px 1000px 0px', threshold: 0.1 });
+    const watchLast = () => {
+        pending = null;
+        const cards = document.querySelectorAll(selector);
+        const last = cards[cards.length - 1];
+        if (!last || last === sentinel) return;
+        if (sentinel) io.unobserve(sentinel);
+        sentinel = last;
+        io.observe(last);
+    };
+    const mo = new MutationObserver(() => { pending ||= setTimeout(watchLast, 50); });
+    mo.observe(document.body, { childList: true, subtree: true });
+    watchLast();
+    window.__autoScroll = () => {
+        clearTimeout(pending);
+        io.disconnect();
+        mo.disconnect();
+        return steps;
+    };
+};
+
+window.__stopAutoScroll = () => {
+    const steps = window.__autoScroll ? window.__autoScroll() : 0;
+    window.__autoScroll = null;
+    return steps;
+};
+"""
+
+# Remove webdriver detection
+_STEALTH_JS = """
+Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+"""
+
+# Extractors for crawl_whats_new and crawl_privacy_labels
+_EXTRACT_VERSIONS_JS = """
+const VERSION_RE = /Version\\s*([\\d.]+)/i;
+
+window.__extractVersions = () => {
+    const versions = [];
+
+    // Look for version history items
+    const versionItems = document.querySelectorAll('[class*="version"]');
+
+    versionItems.forEach(item => {
+        const text = item.textContent.trim();
+        // Try to parse version info
+        const versionMatch = text.match(VERSION_RE);
+        if (versionMatch) {
+            versions.push({
+                version: versionMatch[1],
+                text: text.substring(0, 500)
+            });
+        }
+    });
+
+    // Also get current version from page
+    const currentVersion = document.querySelector('[class*="version"]');
+    if (currentVersion && versions.length === 0) {
+        versions.push({
+            version: currentVersion.textContent.trim(),
+            text: 'Current version'
+        });
+    }
+
+    return versions;
+};
+"""
+
+_EXTRACT_PRIVACY_JS = """
+window.__extractPrivacy = () => {
+    const labels = [];
+
+    // Look for privacy-related sections
+    const privacySections = document.querySelectorAll('[class*="privacy"], [class*="Privacy"]');
+
+    privacySections.forEach(section => {
+        const text = section.textContent.trim();
+        if (text.length > 10 && text.length < 1000) {
+            labels.push({
+                category: 'Privacy Information',
+                text: text.substring(0, 500),
+                data_types: [],
+                purposes: []
+            });
+        }
+    });
+
+    return labels;
+};
+"""
+
+_PAGE_HELPERS_JS = (
+    _EXTRACT_REVIEWS_JS + _SCROLL_REVIEWS_JS + _WAIT_FOR_REVIEWS_JS + _SCROLL_AND_WAIT_JS
+    + _STREAM_REVIEWS_JS + _AUTO_SCROLL_JS + _EXTRACT_VERSIONS_JS + _EXTRACT_PRIVACY_JS
+)
+
+# Everything a context runs before page scripts, registered with a single add_init_script.
+# Wrapped in an IIFE so the helpers' top-level consts stay private instead of landing in
+# the page's global lexical scope, where a same-named declaration in Apple's own scripts
+# would throw; only the window.__* entry points are exposed.
+_CONTEXT_INIT_JS = "(() => {\n" + _STEALTH_JS + _PAGE_HELPERS_JS + "\n})();\n"
+
+# Resource types aborted in every context. Stylesheets are kept: the reviews modal
+# and lazy-loading scroll containers rely on CSS overflow to be scrollable.
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'texttrack', 'manifest'})
+
+# Apple's metrics/telemetry beacons and third-party ad/analytics hosts; fire-and-forget
+# requests nothing we parse waits on
+BLOCKED_HOSTS_RE = re.compile(
+    r'^https?://(?:'
+    r'(?:xp|metrics|securemetrics)\.apple\.com'
+    r'|[^/]*(?:doubleclick\.net|google-analytics\.com|googletagmanager\.com|adsystem\.com)'
+    r')/'
+)
+
+
+async def _block_heavy_resources(route):
+    """Playwright route handler that aborts BLOCKED_RESOURCE_TYPES and telemetry requests."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or BLOCKED_HOSTS_RE.match(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+@dataclass
+class ReviewCollection:
+    """
+    Shared state for one review crawl across concurrent countries.
+
+    Only fingerprints of accepted reviews are kept here; the reviews themselves go
+    straight to the consumer through the accepted queue (None marks a finished country).
+    """
+    max_reviews: int
+    min_rating: Optional[int] = None
+    max_rating: Optional[int] = None
+    seen: Set[int] = field(default_factory=set)
+    accepted: asyncio.Queue = field(default_factory=asyncio.Queue)
+    filled: asyncio.Event = field(default_factory=asyncio.Event)  # Set once max_reviews is reached
+
+    @property
+    def count(self) -> int:
+        return len(self.seen)
+
+    @property
+    def full(self) -> bool:
+        return len(self.seen) >= self.max_reviews
+
+    @property
+    def page_filters(self) -> Dict[str, Optional[int]]:
+        """Rating filters in the shape window.__extractReviews takes, to filter in-page."""
+        return {'minRating': self.min_rating, 'maxRating': self.max_rating}
+
+    def merge(self, batch: List[dict]) -> int:
+        """
+        Apply rating filters, dedup and queue new reviews. Returns the number added.
+
+        Stops at max_reviews, so reviews past the target are never hashed or queued.
+        """
+        # Hot per-review loop: bind lookups to locals and count down the remaining room
+        # instead of re-evaluating the full property for every review
+        remaining = self.max_reviews - len(self.seen)
+        if remaining <= 0:
+            self.filled.set()
+            return 0
+        min_rating, max_rating = self.min_rating, self.max_rating
+        seen, put = self.seen, self.accepted.put_nowait
+        new_count = 0
+        for review in batch:
+            rating = review.get('rating') or 0
+            if min_rating and rating < min_rating:
+                continue
+            if max_rating and rating > max_rating:
+                continue
+            # Use deterministic hash for deduplication (not Python's randomized hash())
+            key = review_key(review.get('author', ''), review.get('content', ''))
+            if key not in seen:
+                seen.add(key)
+                put(review)
+                new_count += 1
+                if new_count == remaining:
+                    self.filled.set()
+                    break
+        return new_count
+
 
 @dataclass
 class BrowserPage:
-    """Container for browser context and page to prevent memory leaks"""
-    context: BrowserContext
+    """A page checked out of the crawler's shared browser context"""
+    context: BrowserContext  # The shared context this page was opened in
     page: Page
+    uses: int = 0  # Completed _managed_page checkouts (one navigation each)
+    reviews: int = 0  # Reviews loaded through this page; heavy scrolls retire it early
+    # Receives batches pushed by window.__streamReviews; set by whichever crawl holds the page
+    review_sink: Optional[Callable[[List[dict]], None]] = None
+
+    def push_reviews(self, payload: str) -> None:
+        """Binding target for window.__pushReviews (a JSON array); drops batches nobody is listening for."""
+        if not self.review_sink:
+            return
+        try:
+            batch = _loads(payload)
+        except ValueError as e:
+            logger.debug(f"Dropping malformed review batch: {e}")
+            return
+        if isinstance(batch, list):
+            self.review_sink(batch)
 
     async def close(self):
-        """Properly close both page and context"""
+        """Close the page; the shared context is closed by the crawler once retired"""
         try:
             if self.page:
                 await self.page.close()
         except Exception as e:
             logger.debug(f"Error closing page: {e}")
-        try:
-            if self.context:
-                await self.context.close()
-        except Exception as e:
-            logger.debug(f"Error closing context: {e}")
 
 
 class AppStoreBrowserCrawler:
     """Crawl App Store reviews using browser automation for unlimited scraping"""
 
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, max_concurrent_countries: int = 4):
         self.headless = headless
+        # A zero/negative limit (e.g. from a misconfigured env var) would deadlock every country
+        max_concurrent_countries = max(1, max_concurrent_countries)
         self.browser: Optional[Browser] = None
         self.playwright = None
-        self._page_lock = asyncio.Lock()  # Prevent race conditions when creating pages
+        self._http_client: Optional[httpx.AsyncClient] = None  # Shared for iTunes API calls
+        self._ctx_sem = asyncio.Semaphore(max_concurrent_countries)  # Bounds concurrent country pages
+        # Bounds simultaneous page creation so a burst of countries doesn't stampede
+        # Chromium's renderer process spawning
+        self._page_create_sem = asyncio.Semaphore(4)
+        # Every country opens its page in one shared context (same origin, same session),
+        # so context startup is paid once per crawler rather than once per country
+        self._context: Optional[BrowserContext] = None
+        self._context_lock = asyncio.Lock()
+        self._context_reviews = 0  # Reviews loaded through the current shared context
+        # Open pages (checked out or parked) per context, so a retired one closes with its last page
+        self._context_pages: Dict[BrowserContext, int] = {}
+        # Playwright keeps every request/response of a context alive until it is closed, so
+        # the shared context is retired (and replaced) after this many reviews
+        self._ctx_max_reviews = 2000
+        # Pages are reused across navigations but recycled after a few uses or a heavy scroll,
+        # since long-lived pages grow their heap with every document they load
+        self._page_max_uses = 5
+        self._page_max_reviews = 500
+        self._idle_pages: List[BrowserPage] = []
+        # Pages opened up front by __aenter__, so early crawls skip the cold start
+        self._warm_page_count = min(2, max_concurrent_countries)
+        # Bearer token captured from a storefront page, reused so later countries can
+        # page the reviews API without opening a browser page at all
+        self._amp_token: Optional[str] = None
+        self._amp_token_expires = 0.0
+        self._api_request: Optional[APIRequestContext] = None
+        # Shared across concurrent countries so bursts to one Apple host stay paced
+        self._apple_limiter = RateLimiter(
+            requests_per_minute=600,
+            max_concurrent=max_concurrent_countries * 2,
+            per_domain_rpm={'apps.apple.com': 60, 'amp-api.apps.apple.com': 300},
+        )
 
     async def __aenter__(self):
         try:
@@ -60,6 +730,12 @@ class AppStoreBrowserCrawler:
                     '--disable-blink-features=AutomationControlled',
                     '--disable-dev-shm-usage',
                     '--no-sandbox',
+                    # Bound memory for long runs in containers: no GPU process or zygote, and
+                    # a capped V8 heap per renderer; gc is exposed so scroll loops can collect
+                    '--no-zygote',
+                    '--disable-gpu',
+                    '--disable-accelerated-2d-canvas',
+                    '--js-flags=--max-old-space-size=512 --expose-gc',
                 ]
             )
         except Exception as e:
@@ -72,57 +748,224 @@ class AppStoreBrowserCrawler:
                     pass
                 self.playwright = None
             raise RuntimeError(f"Browser initialization failed: {e}. Run 'playwright install chromium' if browsers are not installed.")
+        # async with never calls __aexit__ when __aenter__ raises, so tear down the browser,
+        # driver and any warmed context here if the rest of setup fails
+        try:
+            # Page-less HTTP client for the reviews API once a token has been captured, set up
+            # alongside the warm pool so the first crawl starts on ready pages. Both run to
+            # completion before a failure is raised, so neither is left running unowned.
+            api_request, warmed = await asyncio.gather(
+                self.playwright.request.new_context(
+                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                ),
+                self._warm_pages(),
+                return_exceptions=True,
+            )
+            if isinstance(api_request, BaseException):
+                raise api_request
+            self._api_request = api_request
+            if isinstance(warmed, BaseException):
+                raise warmed
+            # One keep-alive client for the crawler's lifetime so lookups reuse the TLS connection
+            self._http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(15.0, connect=5.0),
+                follow_redirects=True,
+                # Keep enough idle connections for concurrent country crawls to share
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=20),
+            )
+        except BaseException:
+            await self.__aexit__(None, None, None)
+            raise
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        while self._idle_pages:
+            await self._idle_pages.pop().close()
+        for context in self._context_pages:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"Error closing context: {e}")
+        self._context_pages.clear()
+        self._context = None
+        if self._api_request:
+            await self._api_request.dispose()
+            self._api_request = None
+        if self._http_client:
+            await self._http_client.aclose()
+            self._http_client = None
         if self.browser:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
 
+    async def _shared_context(self) -> BrowserContext:
+        """Return the shared browser context, creating it on first use or after retirement."""
+        async with self._context_lock:
+            if self._context is None:
+                context = await self.browser.new_context(
+                    viewport={'width': 1920, 'height': 1080},
+                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                    locale='en-US',
+                    storage_state=get_cached_storage_state(),
+                )
+                try:
+                    # Skip screenshots, icons, fonts and video previews - nothing we parse needs them
+                    await context.route('**/*', _block_heavy_resources)
+                    # Stealth patches and page helpers in one registration on the context
+                    await context.add_init_script(_CONTEXT_INIT_JS)
+                except BaseException:
+                    await context.close()
+                    raise
+                self._context = context
+                self._context_reviews = 0
+                self._context_pages[context] = 0
+            return self._context
+
+    async def _warm_pages(self) -> None:
+        """Create the shared context and park _warm_page_count ready pages in the idle list."""
+        try:
+            await self._shared_context()
+            self._idle_pages.extend(
+                await asyncio.gather(*(self._create_page() for _ in range(self._warm_page_count)))
+            )
+        except Exception as e:
+            # Crawls create pages on demand anyway; warming is only a head start
+            logger.warning(f"Could not pre-warm browser pages: {e}")
+
     async def _create_page(self) -> BrowserPage:
         """Create a new page with anti-detection measures.
 
-        Returns a BrowserPage dataclass containing both context and page
-        to ensure proper cleanup and prevent memory leaks.
+        Pages are opened in the shared context (see _shared_context), which already
+        carries the resource blocking and init script, so a page costs one renderer
+        rather than a whole context. _page_create_sem caps how many spin up at once.
         """
-        async with self._page_lock:  # Prevent race conditions
-            context = await self.browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                locale='en-US',
+        context = await self._shared_context()
+        # Count the page before any await so _retire_context can't close the context under it
+        self._context_pages[context] += 1
+        try:
+            async with self._page_create_sem:
+                page = await context.new_page()
+        except BaseException:
+            await self._release_context(context)
+            raise
+        browser_page = BrowserPage(context=context, page=page)
+        try:
+            # Streamed review batches land on whichever sink the page's current crawl set
+            await page.expose_binding(
+                '__pushReviews', lambda source, payload: browser_page.push_reviews(payload)
             )
-            page = await context.new_page()
-
-            # Remove webdriver detection
-            await page.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-                Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
-            """)
-
-            return BrowserPage(context=context, page=page)
+        except BaseException:
+            await self._close_page(browser_page)
+            raise
+        return browser_page
+
+    async def _close_page(self, browser_page: BrowserPage) -> None:
+        """Close a page, and its context too if that was retired and this was its last page."""
+        await browser_page.close()
+        await self._release_context(browser_page.context)
+
+    async def _release_context(self, context: BrowserContext) -> None:
+        """Drop one page from context's count, closing it if retired and now unused."""
+        self._context_pages[context] -= 1
+        if context is not self._context and self._context_pages[context] <= 0:
+            del self._context_pages[context]
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"Error closing context: {e}")
+
+    async def _retire_context(self) -> None:
+        """Send new pages to a fresh context; the old one closes once its pages are done."""
+        retired, self._context = self._context, None
+        parked = [bp for bp in self._idle_pages if bp.context is retired]
+        self._idle_pages = [bp for bp in self._idle_pages if bp.context is not retired]
+        for browser_page in parked:
+            await self._close_page(browser_page)
+        if retired is not None and self._context_pages.get(retired) == 0:
+            del self._context_pages[retired]
+            try:
+                await retired.close()
+            except Exception as e:
+                logger.debug(f"Error closing context: {e}")
 
     @asynccontextmanager
     async def _managed_page(self):
         """Async context manager for automatic page cleanup.
 
+        Reuses an idle page when one is available. A page goes back to the idle
+        list after a clean exit, and is closed instead once it reaches
+        _page_max_uses or _page_max_reviews, its context was retired, or the block
+        raised (including cancellation). The shared context is retired once it has
+        loaded _ctx_max_reviews reviews.
+
         Usage:
             async with self._managed_page() as browser_page:
                 await browser_page.page.goto(url)
         """
-        browser_page = await self._create_page()
+        browser_page = self._idle_pages.pop() if self._idle_pages else await self._create_page()
+        reviews_before = browser_page.reviews
+        reusable = False
         try:
             yield browser_page
+            reusable = True
         finally:
-            await browser_page.close()
+            browser_page.uses += 1
+            browser_page.review_sink = None
+            if browser_page.context is self._context:
+                self._context_reviews += browser_page.reviews - reviews_before
+                if self._context_reviews >= self._ctx_max_reviews:
+                    await self._retire_context()
+            if (
+                reusable
+                and browser_page.context is self._context
+                and browser_page.uses < self._page_max_uses
+                and browser_page.reviews < self._page_max_reviews
+                and not browser_page.page.is_closed()
+            ):
+                try:
+                    # Drop the previous document (and its resource timings) before parking the
+                    # page; cookies are shared by every page in the context, so they stay
+                    await browser_page.page.goto('about:blank')
+                    self._idle_pages.append(browser_page)
+                except Exception as e:
+                    logger.debug(f"Discarding page that failed to reset: {e}")
+                    await self._close_page(browser_page)
+            else:
+                await self._close_page(browser_page)
+
+    async def _request_with_retry(self, url: str, request_factory, retries: int = 3):
+        """
+        Run an Apple request (page.goto or page.request.get) through the rate limiter.
+
+        429/503 responses back off the whole host with exponential delay plus jitter
+        and are retried; the last response is returned either way.
+        """
+        response = None
+        for attempt in range(retries):
+            await self._apple_limiter.acquire(url)
+            try:
+                response = await request_factory()
+            finally:
+                self._apple_limiter.release()
+
+            if response is None or response.status not in RETRYABLE_STATUSES:
+                return response
+
+            if attempt < retries - 1:
+                delay = (2 ** attempt) + random.uniform(0, 1)
+                logger.warning(f"HTTP {response.status} from {url}, retrying in {delay:.1f}s (attempt {attempt + 1}/{retries})")
+                await self._apple_limiter.backoff(url, seconds=delay)
+
+        return response
 
     # Countries with significant App Store review volumes
-    COUNTRIES = [
+    COUNTRIES = (
         'us', 'gb', 'ca', 'au', 'de', 'fr', 'jp', 'kr', 'cn', 'br',
         'mx', 'es', 'it', 'nl', 'se', 'no', 'dk', 'fi', 'ru', 'in',
         'sg', 'hk', 'tw', 'th', 'id', 'my', 'ph', 'vn', 'nz', 'za',
         'ae', 'sa', 'il', 'tr', 'pl', 'cz', 'at', 'ch', 'be', 'ie',
-    ]
+    )
 
     async def crawl_reviews(
         self,
@@ -137,142 +980,293 @@ class AppStoreBrowserCrawler:
         Crawl reviews from the App Store web page.
         When multi_country=True, scrapes from multiple country stores to maximize review count.
         """
-        all_reviews = {}
-        reviews_lock = asyncio.Lock()
+        return [
+            review async for review in self.iter_reviews(
+                app_id, country, max_reviews, min_rating, max_rating, multi_country
+            )
+        ]
+
+    async def iter_reviews(
+        self,
+        app_id: str,
+        country: str = "us",
+        max_reviews: int = 5000,
+        min_rating: Optional[int] = None,
+        max_rating: Optional[int] = None,
+        multi_country: bool = True,
+    ) -> AsyncIterator[dict]:
+        """
+        Stream reviews from the App Store web page as soon as each one is deduped.
+
+        Same crawl as crawl_reviews, but the caller can persist reviews while later
+        countries are still loading. Yields at most max_reviews; stopping iteration
+        early cancels the countries still in flight.
+        """
+        collection = ReviewCollection(max_reviews, min_rating, max_rating)
 
         # Determine which countries to scrape - use more countries for better coverage
         # Always include the requested country first, then add high-volume countries
         if multi_country and max_reviews > 100:
-            priority_countries = ['us', 'gb', 'ca', 'au', 'de', 'fr', 'jp', 'in', 'br', 'mx', 'es', 'it', 'nl', 'kr', 'ru', 'sg']
-            # Always start with the requested country, then add other priority countries
-            countries_to_scrape = [country] + [c for c in priority_countries if c != country]
-
             # Scale browser countries based on target
             if max_reviews >= 3000:
-                countries_to_scrape = countries_to_scrape[:16]
+                country_limit = 16
             elif max_reviews >= 1500:
-                countries_to_scrape = countries_to_scrape[:12]
+                country_limit = 12
             else:
-                countries_to_scrape = countries_to_scrape[:8]
+                country_limit = 8
+            # Always start with the requested country, then add other priority countries
+            countries_to_scrape = tuple(dict.fromkeys((country, *PRIORITY_COUNTRIES)))[:country_limit]
         else:
-            countries_to_scrape = [country]
+            countries_to_scrape = (country,)
 
         logger.info(f"Starting browser crawl for app {app_id}, target: {max_reviews} reviews, countries: {len(countries_to_scrape)}")
 
-        # Process each country with a fresh browser page to avoid stale state
-        for country_index, current_country in enumerate(countries_to_scrape):
-            if len(all_reviews) >= max_reviews:
-                logger.info(f"Reached target of {max_reviews} reviews, stopping early")
-                break
-
-            logger.info(f"Starting country {country_index + 1}/{len(countries_to_scrape)}: {current_country}")
+        # Countries are I/O-bound on page loads, so crawl several at once, each in
+        # its own page of the shared context, bounded by the crawler-wide semaphore
+        country_budget = max(COUNTRY_BUDGET_MIN_SECONDS, max_reviews * COUNTRY_BUDGET_SECONDS_PER_REVIEW)
 
+        async def crawl_with_limit(current_country: str) -> None:
             try:
-                async with self._managed_page() as browser_page:
-                    page = browser_page.page
+                async with self._ctx_sem:
+                    if collection.full:
+                        return
+                    logger.info(f"Starting country: {current_country}")
+                    try:
+                        async with asyncio.timeout(country_budget):
+                            await self._crawl_country(app_id, current_country, collection)
+                    except TimeoutError:
+                        # Reviews merged before the deadline are kept; siblings carry on
+                        logger.warning(f"Country {current_country} exceeded its {country_budget:.0f}s budget, moving on")
+            finally:
+                # Marks this country finished; always queued after its reviews
+                collection.accepted.put_nowait(None)
+
+        tasks = [asyncio.create_task(crawl_with_limit(c)) for c in countries_to_scrape]
+
+        # Cancel in-flight navigations, waits and API pages the moment the target is
+        # reached, rather than when each country next checks or the consumer catches up
+        async def cancel_when_filled() -> None:
+            await collection.filled.wait()
+            for task in tasks:
+                task.cancel()
+
+        watcher = asyncio.create_task(cancel_when_filled())
+        countries_running = len(tasks)
+        yielded = 0
+        try:
+            while countries_running and yielded < max_reviews:
+                review = await collection.accepted.get()
+                if review is None:
+                    countries_running -= 1
+                    continue
+                yield review
+                yielded += 1
+            if yielded >= max_reviews:
+                logger.info(f"Reached target of {max_reviews} reviews, stopping early")
+        finally:
+            watcher.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(watcher, *tasks, return_exceptions=True)
 
-                    # Try to load the app page for this country
-                    url = f"https://apps.apple.com/{current_country}/app/id{app_id}"
+        logger.info(f"Browser crawl complete: {yielded} reviews collected from {len(countries_to_scrape)} countries")
 
-                    page_loaded = False
-                    try:
-                        logger.info(f"Trying URL: {url}")
-                        response = await page.goto(url, wait_until='domcontentloaded', timeout=30000)
-
-                        if response:
-                            # Check for redirects - Apple may redirect to different country
-                            final_url = page.url
-                            if response.status == 200:
-                                page_loaded = True
-                                if final_url != url:
-                                    logger.info(f"Redirected to: {final_url}")
-                            elif response.status in (301, 302, 303, 307, 308):
-                                # Follow redirects - page might have loaded anyway
-                                page_loaded = True
-                                logger.info(f"Redirect {response.status} to: {final_url}")
-                            else:
-                                logger.warning(f"Page returned status {response.status} for {current_country}")
-                        else:
-                            logger.warning(f"No response received for {current_country}")
+    async def _crawl_country(self, app_id: str, current_country: str, collection: ReviewCollection) -> int:
+        """
+        Scrape one country's reviews listing in its own browser page.
 
-                    except Exception as e:
-                        logger.warning(f"Failed to load page for {current_country}: {e}")
+        New reviews are merged into the shared collection as each batch is extracted,
+        so concurrent countries see the running total and stop once it is full.
+        Returns the number of reviews this country added.
+        """
+        total_new_this_country = 0
 
-                    if not page_loaded:
-                        logger.warning(f"Could not load page for country {current_country}")
-                        continue
+        # A token captured by an earlier country skips Chromium entirely for this one
+        token = self._cached_amp_token()
+        if token:
+            api_added = await self._crawl_reviews_api(
+                self._api_request, app_id, current_country, token, collection
+            )
+            if api_added is not None:
+                logger.info(f"Country {current_country}: got {api_added} new reviews via API with cached token (total: {collection.count})")
+                return api_added
+            # Rejected on the first page; drop the token and recapture it from the storefront
+            self._amp_token = None
 
-                    # Wait for page to fully render
-                    await asyncio.sleep(3)
+        try:
+            async with self._managed_page() as browser_page:
+                page = browser_page.page
 
-                    # Try to click "See All Reviews" link if present
-                    try:
-                        # Try proper Playwright locator API first (more resilient than CSS pseudo-selectors)
-                        see_all_clicked = False
-                        for link_text in ['See All', 'Ratings and Reviews']:
-                            try:
-                                see_all = page.locator('a', has_text=link_text).first
-                                if await see_all.is_visible(timeout=2000):
-                                    await see_all.click(timeout=5000)
-                                    await asyncio.sleep(2)
-                                    logger.info(f"Clicked '{link_text}' link for {current_country}")
-                                    see_all_clicked = True
-                                    break
-                            except (PlaywrightTimeout, Exception) as e:
-                                logger.debug(f"Link text '{link_text}' failed: {e}")
-                                continue
-
-                        # Fallback: try CSS selectors
-                        if not see_all_clicked:
-                            fallback_selectors = [
-                                'a[href*="see-all=reviews"]',
-                                '.we-truncate__button',
-                            ]
-                            for selector in fallback_selectors:
-                                try:
-                                    link = page.locator(selector).first
-                                    if await link.is_visible(timeout=2000):
-                                        await link.click()
-                                        await asyncio.sleep(2)
-                                        logger.info(f"Clicked fallback selector for {current_country}")
-                                        break
-                                except (PlaywrightTimeout, Exception) as e:
-                                    logger.debug(f"Fallback selector {selector} failed: {e}")
-                                    continue
-                    except Exception as e:
-                        logger.warning(f"Could not find 'See All' button: {e}")
+                # Load the full reviews listing directly instead of the app page + "See All" click
+                url = f"https://apps.apple.com/{current_country}/app/id{app_id}?see-all=reviews"
+
+                # The page's own amp-api calls carry a bearer token we can reuse for the JSON API
+                token_future = asyncio.get_running_loop().create_future()
 
-                    # Extract reviews with multiple scroll attempts
-                    total_new_this_country = 0
-                    no_new_reviews_count = 0
+                def capture_token(request):
+                    if not token_future.done() and 'amp-api' in request.url:
+                        auth = request.headers.get('authorization')
+                        if auth:
+                            token_future.set_result(auth)
 
-                    for scroll_attempt in range(25):  # Increased from 10 to 25 for better coverage
-                        if len(all_reviews) >= max_reviews:
-                            break
+                page.on('request', capture_token)
 
-                        page_reviews = await self._extract_reviews(page, current_country)
+                page_loaded = False
+                try:
+                    logger.info(f"Trying URL: {url}")
+                    # Return on the first response byte; readiness is the review cards
+                    # rendering (waited for below), not DOMContentLoaded and its subresources
+                    response = await self._request_with_retry(
+                        url, lambda: page.goto(url, wait_until='commit', timeout=15000)
+                    )
+
+                    if response:
+                        # Check for redirects - Apple may redirect to different country
+                        final_url = page.url
+                        if response.status == 200:
+                            page_loaded = True
+                            if final_url != url:
+                                logger.info(f"Redirected to: {final_url}")
+                        elif response.status in (301, 302, 303, 307, 308):
+                            # Follow redirects - page might have loaded anyway
+                            page_loaded = True
+                            logger.info(f"Redirect {response.status} to: {final_url}")
+                        else:
+                            logger.warning(f"Page returned status {response.status} for {current_country}")
+                    else:
+                        logger.warning(f"No response received for {current_country}")
 
-                        new_count = 0
-                        for review in page_reviews:
-                            # Use deterministic hash for deduplication (not Python's randomized hash())
-                            content_key = f"{review.get('author', '')}:{review.get('content', '')[:100]}"
-                            review_id = hashlib.sha256(content_key.encode()).hexdigest()[:16]
+                except Exception as e:
+                    logger.warning(f"Failed to load page for {current_country}: {e}")
 
-                            async with reviews_lock:
-                                if review_id in all_reviews:
-                                    continue
+                if not page_loaded:
+                    page.remove_listener('request', capture_token)
+                    logger.warning(f"Could not load page for country {current_country}")
+                    return 0
 
-                                rating = review.get('rating', 0)
-                                if min_rating and rating < min_rating:
-                                    continue
-                                if max_rating and rating > max_rating:
-                                    continue
+                # Wait for the first review cards to render rather than a fixed delay; the
+                # budget covers the document load too, since goto only waited for commit
+                try:
+                    await page.wait_for_selector(REVIEW_CARD_SELECTOR, timeout=20000)
+                except PlaywrightTimeout:
+                    logger.debug(f"No review cards rendered yet for {current_country}")
 
-                                all_reviews[review_id] = review
-                                new_count += 1
+                page.remove_listener('request', capture_token)
 
+                if get_cached_storage_state() is None:
+                    try:
+                        cache_storage_state(await browser_page.context.storage_state())
+                    except Exception as e:
+                        logger.debug(f"Could not capture storage state: {e}")
+
+                # Preferred path: page through Apple's JSON reviews API with the captured
+                # token, skipping DOM scrolling and extraction entirely
+                if token_future.done():
+                    self._amp_token = token_future.result()
+                    self._amp_token_expires = time.monotonic() + AMP_TOKEN_TTL
+                    api_added = await self._crawl_reviews_api(
+                        page.request, app_id, current_country, self._amp_token, collection
+                    )
+                    if api_added is not None:
+                        browser_page.reviews += api_added
+                        logger.info(f"Country {current_country}: got {api_added} new reviews via API (total: {collection.count})")
+                        return api_added
+
+                # Apple may redirect away from the listing (dropping the query string);
+                # only then fall back to clicking "See All Reviews" on the app page
+                if 'see-all=reviews' not in page.url:
+                    # Click the first visible "See All Reviews" link with a single union locator
+                    try:
+                        await page.locator(SEE_ALL_REVIEWS_SELECTOR).first.click(timeout=2000)
+                        await page.wait_for_load_state('domcontentloaded')
+                        logger.info(f"Clicked 'See All' link for {current_country}")
+                    except PlaywrightTimeout:
+                        logger.debug(f"No 'See All' link found for {current_country}")
+                    except Exception as e:
+                        logger.warning(f"Could not click 'See All' button: {e}")
+
+                # Extract reviews with multiple scroll attempts; each extraction only
+                # returns cards not seen by earlier ones on this page
+                no_new_reviews_count = 0
+                observer_timeouts = 0
+                cards_landed = True
+                json_seen = False
+                slowest_batch_ms = 1000  # Until measured, assume a moderately slow network
+
+                # Svelte fetches further review pages from amp-api as we scroll; read that
+                # JSON directly and skip the DOM walk once it shows up
+                intercepted: List[dict] = []
+                # (token, next offset) from the first intercepted page that has a next cursor
+                api_handoff: List[Tuple[str, int]] = []
+                handoff_tried = False
+
+                async def capture_reviews(response):
+                    if 'amp-api' not in response.url or '/reviews' not in response.url or not response.ok:
+                        return
+                    try:
+                        payload = await response.json()
+                    except Exception:
+                        return
+                    items = (payload.get('data') or []) if isinstance(payload, dict) else []
+                    intercepted.extend(
+                        self._review_from_api(item, current_country) for item in items if isinstance(item, dict)
+                    )
+                    auth = response.request.headers.get('authorization')
+                    next_offset = AMP_NEXT_OFFSET_RE.search(payload.get('next') or '') if isinstance(payload, dict) else None
+                    if auth and next_offset and not api_handoff:
+                        api_handoff.append((auth, int(next_offset.group(1))))
+
+                page.on('response', capture_reviews)
+
+                # The page pushes reviews as their cards render (see _STREAM_REVIEWS_JS), starting
+                # with whatever came with the initial load; scroll steps only scroll and wait
+                streamed: List[dict] = []
+
+                def stream_reviews(batch: List[dict]) -> None:
+                    for review in batch:
+                        review['country'] = current_country
+                        review['source'] = 'browser'
+                    streamed.extend(batch)
+
+                browser_page.review_sink = stream_reviews
+                await self._stream_reviews(page, current_country, collection.page_filters)
+                await self._start_auto_scroll(page)
+
+                for scroll_attempt in range(MAX_SCROLL_ATTEMPTS):
+                    if collection.full:
+                        break
+
+                    # Merge whatever the stream and the intercepted JSON delivered since the
+                    # last step; a step where nothing landed has nothing to count
+                    if cards_landed or intercepted or streamed:
+                        new_count = collection.merge(streamed)
+                        streamed.clear()
+                        if intercepted:
+                            if not json_seen:
+                                # The JSON carries the same reviews; stop walking the DOM for them
+                                json_seen = True
+                                await self._stop_review_stream(page)
+                            new_count += collection.merge(intercepted)
+                            intercepted.clear()
                         total_new_this_country += new_count
 
+                        # The page's own XHR exposed a token and a next cursor: page the
+                        # API directly from there instead of rendering more of the DOM
+                        if api_handoff and not handoff_tried and not collection.full:
+                            handoff_tried = True
+                            # Stop the page requesting more reviews itself while the API pages them
+                            await self._stop_auto_scroll(page)
+                            token, next_offset = api_handoff[0]
+                            self._amp_token = token
+                            self._amp_token_expires = time.monotonic() + AMP_TOKEN_TTL
+                            api_added = await self._crawl_reviews_api(
+                                page.request, app_id, current_country, token, collection, start_offset=next_offset
+                            )
+                            if api_added is not None:
+                                total_new_this_country += api_added
+                                logger.info(f"Country {current_country}: continued via API from offset {next_offset}")
+                                break
+
                         if new_count == 0:
                             no_new_reviews_count += 1
                             if no_new_reviews_count >= 5:  # Increased from 3 to 5 for lazy-loading tolerance
@@ -281,338 +1275,234 @@ class AppStoreBrowserCrawler:
                         else:
                             no_new_reviews_count = 0
 
-                        if scroll_attempt < 24:
-                            await self._scroll_page(page)
-                            # Longer wait for early scrolls when page is still loading
-                            wait_time = 2.5 if scroll_attempt < 5 else 1.5
-                            await asyncio.sleep(wait_time)
+                    if scroll_attempt < MAX_SCROLL_ATTEMPTS - 1:
+                        # Wait for new review cards instead of sleeping a fixed interval;
+                        # early scrolls get more headroom while the page is still loading,
+                        # later ones a multiple of the slowest batch seen on this page
+                        if scroll_attempt < 5:
+                            timeout_ms = 5000
+                        else:
+                            timeout_ms = min(6000, max(1500, 3 * slowest_batch_ms))
+                        # Reviews arrive through the stream, so the step only scrolls and waits
+                        cards_landed, waited_ms = await self._scroll_for_reviews(page, timeout_ms)
+                        if (scroll_attempt + 1) % GC_EVERY_SCROLLS == 0:
+                            await self._collect_garbage(page)
+                        if cards_landed:
+                            slowest_batch_ms = max(slowest_batch_ms, waited_ms)
+                            observer_timeouts = 0
+                        else:
+                            observer_timeouts += 1
+                            if observer_timeouts >= 2:
+                                logger.info(f"No new review cards after {scroll_attempt + 1} scrolls, moving to next country")
+                                break
+
+                page.remove_listener('response', capture_reviews)
+                browser_page.review_sink = None
+                auto_scrolls = await self._stop_auto_scroll(page)
+                await self._stop_review_stream(page)
+                logger.debug(f"Country {current_country}: {auto_scrolls} scrolls chained in-page")
+                if not collection.full:
+                    total_new_this_country += collection.merge(streamed) + collection.merge(intercepted)
+                browser_page.reviews += total_new_this_country
+
+                logger.info(f"Country {current_country}: got {total_new_this_country} new reviews (total: {collection.count})")
+
+        except asyncio.CancelledError:
+            # iter_reviews cancels countries still in flight once max_reviews is reached
+            logger.debug(f"Country {current_country} cancelled after {total_new_this_country} new reviews (total: {collection.count})")
+            raise
+        except Exception as e:
+            # Don't fail entire operation - other countries keep going
+            logger.error(f"Failed to scrape country {current_country}: {e}")
+
+        return total_new_this_country
+
+    def _cached_amp_token(self) -> Optional[str]:
+        """Return the captured amp-api bearer token if it is still within AMP_TOKEN_TTL."""
+        if self._amp_token and time.monotonic() < self._amp_token_expires:
+            return self._amp_token
+        return None
+
+    async def _crawl_reviews_api(
+        self,
+        request_context: APIRequestContext,
+        app_id: str,
+        country: str,
+        token: str,
+        collection: ReviewCollection,
+        start_offset: int = 0,
+    ) -> Optional[int]:
+        """
+        Page through Apple's amp-api reviews endpoint from start_offset.
 
-                    logger.info(f"Country {current_country}: got {total_new_this_country} new reviews (total: {len(all_reviews)})")
+        request_context is either a page's own request context or the crawler's
+        page-less one, which is enough once a token has been captured.
 
+        Returns the number of reviews added (0 for an empty storefront), or None if
+        the very first request failed - an HTTP error such as 401/403 or a body that
+        is not a JSON object - so the caller can drop the token and fall back to DOM
+        scraping.
+        """
+        url = AMP_REVIEWS_URL.format(country=country, app_id=app_id)
+        headers = {'Authorization': token, 'Origin': 'https://apps.apple.com'}
+        offset = start_offset
+        added = 0
+
+        while not collection.full:
+            try:
+                response = await self._request_with_retry(url, lambda: request_context.get(
+                    url,
+                    params={
+                        'l': 'en-US',
+                        'offset': offset,
+                        'limit': 20,
+                        'platform': 'web',
+                        'additionalPlatforms': 'appletv,ipad,iphone,mac',
+                    },
+                    headers=headers,
+                    timeout=15000,
+                ))
+                if not response.ok:
+                    logger.debug(f"Reviews API returned {response.status} for {country} at offset {offset}")
+                    return None if offset == start_offset else added
+                payload = await response.json()
             except Exception as e:
-                logger.error(f"Failed to scrape country {current_country}: {e}")
-                continue  # Don't fail entire operation - try next country
+                logger.debug(f"Reviews API request failed for {country} at offset {offset}: {e}")
+                return None if offset == start_offset else added
+
+            if not isinstance(payload, dict):
+                logger.debug(f"Reviews API returned an unexpected body for {country} at offset {offset}")
+                return None if offset == start_offset else added
+            items = payload.get('data') or []
+            if not items:
+                break
 
-            # Delay between countries
-            await asyncio.sleep(1.5)
+            batch = [self._review_from_api(item, country) for item in items if isinstance(item, dict)]
+            added += collection.merge(batch)
+            offset += len(items)
 
-        logger.info(f"Browser crawl complete: {len(all_reviews)} reviews collected from {len(countries_to_scrape)} countries")
+            if not payload.get('next'):
+                break
 
-        return list(all_reviews.values())[:max_reviews]
+        return added
+
+    @staticmethod
+    def _review_from_api(item: dict, country: str) -> dict:
+        """Convert an amp-api user-review resource to the crawler's review dict."""
+        attrs = item.get('attributes') or {}
+        rating = attrs.get('rating')
+        return {
+            'id': str(item.get('id', '')),
+            'date': attrs.get('date', ''),
+            'author': attrs.get('userName') or 'Anonymous',
+            'content': (attrs.get('review') or '')[:5000],
+            'rating': rating if rating in (1, 2, 3, 4, 5) else None,
+            'title': attrs.get('title', ''),
+            'country': country,
+            'source': 'browser',
+        }
 
     async def _get_app_url(self, app_id: str, country: str) -> Optional[str]:
         """Get the full app URL from iTunes lookup API"""
-        import httpx
+        if not self._http_client:
+            raise RuntimeError("Crawler not initialized. Use 'async with' context.")
+
+        # Shares the RSS crawler's lookup cache, so a recent lookup skips the request
+        cached = get_cached_lookup(app_id, country)
+        if cached is not None:
+            return cached.get('trackViewUrl')
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"https://itunes.apple.com/lookup?id={app_id}&country={country}"
-                )
-                data = response.json()
+            response = await self._http_client.get(
+                f"https://itunes.apple.com/lookup?id={app_id}&country={country}"
+            )
+            data = response.json()
 
-                if isinstance(data, dict) and data.get('results'):
-                    result = data['results'][0]
-                    if isinstance(result, dict):
-                        return result.get('trackViewUrl')
+            if isinstance(data, dict) and data.get('results'):
+                result = data['results'][0]
+                if isinstance(result, dict):
+                    cache_lookup(app_id, country, result)
+                    return result.get('trackViewUrl')
         except Exception as e:
             logger.error(f"Error getting app URL: {e}")
 
         return None
 
-    async def _extract_reviews(self, page: Page, country: str) -> List[dict]:
-        """Extract review data from the page using updated selectors for Apple's Svelte-based DOM"""
-        reviews = []
+    async def _stream_reviews(self, page: Page, country: str, filters: Optional[dict] = None) -> int:
+        """
+        Start pushing reviews from the page to its BrowserPage.review_sink as cards render.
 
+        Cards already on the page are extracted and pushed straight away; later ones
+        follow from a MutationObserver, so no per-scroll evaluate carries review data.
+        Rating filters run in-page too, so rejected reviews are never serialized back.
+        Returns the number of reviews pushed for the initial render.
+        """
         try:
-            # Extract reviews using JavaScript with multi-strategy selectors for Apple's Svelte-based DOM
-            reviews_data = await page.evaluate(r"""
-                () => {
-                    const results = [];
-                    const seenContent = new Set();
-
-
-                    // Strategy 1: Modern Apple DOM - review containers by common patterns
-                    let reviewCards = Array.from(document.querySelectorAll('[class*="review"], [class*="Review"], [data-test*="review"]'));
-                    reviewCards = reviewCards.filter(el => el.textContent.length > 50 && el.querySelector('*'));
-
-                    // Strategy 2: Original selectors - article elements with review ID
-                    if (reviewCards.length === 0) {
-                        reviewCards = Array.from(document.querySelectorAll('article[aria-labelledby^="review-"]'));
-                    }
-
-                    // Strategy 3: Star rating elements - traverse up
-                    if (reviewCards.length === 0) {
-                        const starEls = document.querySelectorAll('[aria-label*="Star"], [aria-label*="star"], figure[role="img"]');
-                        const seen = new Set();
-                        starEls.forEach(star => {
-                            let parent = star.closest('article, section, [class*="review"]');
-                            if (!parent) { parent = star.parentElement; for (let i=0;i<5&&parent;i++){if(parent.textContent.length>80)break;parent=parent.parentElement;} }
-                            if (parent && !seen.has(parent) && parent.textContent.length > 50) { seen.add(parent); reviewCards.push(parent); }
-                        });
-                    }
-
-                    // Strategy 4: elements with review-header class
-                    if (reviewCards.length === 0) {
-                        const reviewHeaders = document.querySelectorAll('.review-header');
-                        reviewHeaders.forEach(header => {
-                            const article = header.closest('article');
-                            if (article && !reviewCards.includes(article)) {
-                                reviewCards.push(article);
-                            }
-                        });
-                        console.log('Strategy 4: Found ' + reviewCards.length + ' review cards via .review-header');
-                    }
-
-                    // Strategy 5: ol.stars with aria-label and traverse up
-                    if (reviewCards.length === 0) {
-                        const starLists = document.querySelectorAll('ol.stars[aria-label*="Star"]');
-                        starLists.forEach(stars => {
-                            const article = stars.closest('article');
-                            if (article && !reviewCards.includes(article)) {
-                                reviewCards.push(article);
-                            }
-                        });
-                        console.log('Strategy 5: Found ' + reviewCards.length + ' review cards via ol.stars');
-                    }
-
-                    if (reviewCards.length === 0) { console.log('WARNING: No review cards found with any strategy'); }
-                    console.log('Total cards: ' + reviewCards.length);
-
-                    // Process each review card
-                    reviewCards.forEach((card, index) => {
-                        try {
-                            // Extract title - try multiple selectors
-                            let title = '';
-                            const titleSels = ['h3.title .multiline-clamp__text', 'h3[id^="review-"] .multiline-clamp__text', 'h3.title', 'h3[id^="review-"]', '[class*="title"] h3', 'h3'];
-                            for (const sel of titleSels) {
-                                const el = card.querySelector(sel);
-                                if (el && el.textContent.trim().length > 0) { title = el.textContent.trim(); break; }
-                            }
-
-                            // Extract rating - try multiple approaches
-                            let rating = 0;
-                            const starsEl = card.querySelector('ol.stars[aria-label], [aria-label*="Star"], [aria-label*="star"]');
-                            if (starsEl) {
-                                const ariaLabel = starsEl.getAttribute('aria-label') || '';
-                                const match = ariaLabel.match(/(\d+)\s*Stars?/i);
-                                if (match) {
-                                    rating = parseInt(match[1]);
-                                }
-                            }
-
-                            // Approach 2: figure with aria-label
-                            if (rating === 0) {
-                                const figureEl = card.querySelector('figure[aria-label*="star" i], figure[role="img"][aria-label]');
-                                if (figureEl) {
-                                    const al = figureEl.getAttribute('aria-label') || '';
-                                    const m = al.match(/(\d+)/);
-                                    if (m) rating = parseInt(m[1]);
-                                }
-                            }
-
-                            // Approach 3: Count filled star elements
-                            if (rating === 0) {
-                                const starItems = card.querySelectorAll('ol.stars li.star, [class*="star-filled"], [class*="StarFilled"]');
-                                if (starItems.length > 0 && starItems.length <= 5) {
-                                    rating = starItems.length;
-                                }
-                            }
-
-                            // Extract date - try multiple selectors
-                            let date = '';
-                            let dateISO = '';
-                            const timeEl = card.querySelector('time.date, time[datetime], [class*="date"] time, time');
-                            if (timeEl) {
-                                date = timeEl.textContent.trim();
-                                dateISO = timeEl.getAttribute('datetime') || '';
-                            }
-
-                            // Extract author - try multiple selectors
-                            let author = '';
-                            const authorSels = ['p.author', '.author', '[class*="author"]', '[class*="Author"]'];
-                            for (const sel of authorSels) {
-                                const el = card.querySelector(sel);
-                                if (el && el.textContent.trim().length > 0) { author = el.textContent.trim(); break; }
-                            }
-
-                            // Extract content - try multiple selectors
-                            let content = '';
-                            const contentEl = card.querySelector('p[data-testid="truncate-text"], div.content p.content, div.content p, [class*="content"] p, [class*="body"] p');
-                            if (contentEl) {
-                                content = contentEl.textContent.trim();
-                            }
-
-                            // Fallback: get text from content div
-                            if (!content) {
-                                const contentDiv = card.querySelector('div.content, [class*="content"], [class*="body"]');
-                                if (contentDiv) {
-                                    content = contentDiv.textContent.trim();
-                                }
-                            }
-
-                            // Skip if no meaningful content
-                            if (!content || content.length < 10) return;
-
-                            // Dedupe by content
-                            const contentKey = content.substring(0, 100);
-                            if (seenContent.has(contentKey)) return;
-                            seenContent.add(contentKey);
-
-                            // Get review ID from aria-labelledby if available
-                            const ariaLabelledBy = card.getAttribute('aria-labelledby') || '';
-                            const reviewIdMatch = ariaLabelledBy.match(/review-(\d+)/);
-                            const reviewId = reviewIdMatch ? reviewIdMatch[1] : `browser_${index}_${Date.now()}`;
-
-                            const validRating = (rating >= 1 && rating <= 5) ? rating : null;
-                            results.push({
-                                id: reviewId,
-                                date: date,
-                                dateISO: dateISO,
-                                author: author || 'Anonymous',
-                                content: content.substring(0, 5000),
-                                rating: validRating,
-                                title: title,
-                            });
-                        } catch (e) {
-                            console.error('Error extracting review:', e);
-                        }
-                    });
-
-                    console.log('Extracted ' + results.length + ' valid reviews');
-                    return results;
-                }
-            """)
-
-            # Handle null/empty result from JavaScript evaluation
-            if not reviews_data:
-                logger.warning(f"No reviews extracted from {country} page (JS returned null/empty)")
-                return reviews
-
-            for review in reviews_data:
-                review['country'] = country
-                review['source'] = 'browser'
-                reviews.append(review)
-
-            logger.info(f"Extracted {len(reviews)} reviews from {country} page view")
-
-        except PlaywrightTimeout:
-            logger.warning("Timeout waiting for review elements")
+            pushed = await page.evaluate("(filters) => window.__streamReviews(filters)", filters or {})
+            logger.info(f"Extracted {pushed} reviews from {country} page view")
+            return int(pushed or 0)
         except Exception as e:
-            logger.error(f"Error extracting reviews: {e}")
+            logger.error(f"Error starting review stream: {e}")
+            return 0
 
-        return reviews
+    @staticmethod
+    async def _stop_review_stream(page: Page) -> None:
+        """Disconnect the page's review stream; a closed or navigated page has none left."""
+        try:
+            await page.evaluate("() => window.__stopReviewStream && window.__stopReviewStream()")
+        except Exception as e:
+            logger.debug(f"Error stopping review stream: {e}")
 
-    async def _scroll_page(self, page: Page):
-        """Scroll down to load more reviews - handles both modal and page scrolling"""
+    @staticmethod
+    async def _start_auto_scroll(page: Page) -> None:
+        """Let the page chain scrolls itself as new cards land (see _AUTO_SCROLL_JS)."""
         try:
-            # First, try to find and scroll the reviews modal container
-            # Apple's "See All Reviews" opens a modal with its own scrollable container
-            modal_scrolled = await page.evaluate("""
-                () => {
-                    // Common modal/dialog selectors for Apple's App Store
-                    const modalSelectors = [
-                        // Dialog/modal containers
-                        '[role="dialog"]',
-                        '[role="dialog"] [class*="scroll"]',
-                        '[aria-modal="true"]',
-                        // Apple-specific modal content areas
-                        '.modal__content',
-                        '.we-modal__content',
-                        '[class*="modal"] [class*="content"]',
-                        '[class*="dialog"] [class*="content"]',
-                        // Scrollable containers within modals
-                        '[class*="review"] [class*="scroll"]',
-                        '[class*="reviews-list"]',
-                        // Generic scrollable containers that might contain reviews
-                        '[class*="infinite-scroll"]',
-                        '[class*="virtual-scroll"]',
-                    ];
-
-                    for (const selector of modalSelectors) {
-                        const containers = document.querySelectorAll(selector);
-                        for (const container of containers) {
-                            // Check if this container is scrollable
-                            const isScrollable = container.scrollHeight > container.clientHeight;
-                            const hasReviews = container.querySelector('article[aria-labelledby^="review-"]') !== null ||
-                                             container.querySelector('.review-header') !== null;
-
-                            if (isScrollable && (hasReviews || container.closest('[role="dialog"]'))) {
-                                // Scroll this container
-                                const scrollAmount = container.clientHeight * 0.8;
-                                container.scrollTop += scrollAmount;
-                                console.log(`Scrolled modal container: ${selector}, by ${scrollAmount}px`);
-                                return { scrolled: true, selector: selector, scrollTop: container.scrollTop };
-                            }
-                        }
-                    }
-
-                    // Also check for any scrollable parent of review articles
-                    const reviewArticle = document.querySelector('article[aria-labelledby^="review-"]');
-                    if (reviewArticle) {
-                        let parent = reviewArticle.parentElement;
-                        while (parent && parent !== document.body) {
-                            if (parent.scrollHeight > parent.clientHeight + 10) {
-                                const scrollAmount = parent.clientHeight * 0.8;
-                                parent.scrollTop += scrollAmount;
-                                console.log(`Scrolled review parent container, by ${scrollAmount}px`);
-                                return { scrolled: true, selector: 'review-parent', scrollTop: parent.scrollTop };
-                            }
-                            parent = parent.parentElement;
-                        }
-                    }
-
-                    return { scrolled: false };
-                }
-            """)
-
-            if modal_scrolled and modal_scrolled.get('scrolled'):
-                logger.debug(f"Scrolled modal container: {modal_scrolled.get('selector')}")
-                # Wait for lazy-loaded content in modal
-                await asyncio.sleep(0.8)
-                return
-
-            # Fallback: scroll the main page (for non-modal review pages)
-            scroll_info = await page.evaluate("""
-                () => {
-                    const scrollY = window.scrollY;
-                    const innerHeight = window.innerHeight;
-                    const scrollHeight = document.body.scrollHeight;
-                    return { scrollY, innerHeight, scrollHeight };
-                }
-            """)
-
-            # Scroll down gradually to trigger lazy loading
-            current_pos = scroll_info['scrollY']
-            target_pos = current_pos + scroll_info['innerHeight'] * 1.5
-
-            # Smooth scroll
-            await page.evaluate(f"""
-                () => {{
-                    window.scrollTo({{
-                        top: {target_pos},
-                        behavior: 'smooth'
-                    }});
-                }}
-            """)
-
-            await asyncio.sleep(0.5)
-
-            # Also scroll to bottom
-            await page.evaluate("""
-                () => {
-                    window.scrollTo(0, document.body.scrollHeight);
-                }
-            """)
+            await page.evaluate(
+                "([selector, maxSteps]) => window.__startAutoScroll(selector, maxSteps)",
+                [REVIEW_CARD_SELECTOR, MAX_SCROLL_ATTEMPTS],
+            )
+        except Exception as e:
+            logger.debug(f"Error starting auto-scroll: {e}")
 
-            # Press End key as additional trigger
-            await page.keyboard.press('End')
+    @staticmethod
+    async def _stop_auto_scroll(page: Page) -> int:
+        """Stop in-page scrolling; returns how many scrolls it chained (0 if it never ran)."""
+        try:
+            return int(await page.evaluate("() => window.__stopAutoScroll ? window.__stopAutoScroll() : 0") or 0)
+        except Exception as e:
+            logger.debug(f"Error stopping auto-scroll: {e}")
+            return 0
 
-            # Wait for any lazy-loaded content
-            await asyncio.sleep(1)
+    @staticmethod
+    async def _collect_garbage(page: Page) -> None:
+        """Force a V8 collection on a long-scrolling page, where the browser exposes window.gc."""
+        try:
+            await page.evaluate("() => { if (window.gc) window.gc(); }")
+        except Exception as e:
+            logger.debug(f"Error collecting garbage: {e}")
 
+    async def _scroll_for_reviews(self, page: Page, timeout_ms: int = 3000) -> Tuple[bool, int]:
+        """
+        Scroll for more reviews and wait for new cards in one evaluate.
+
+        Handles both the reviews modal and plain page scrolling (see _SCROLL_REVIEWS_JS).
+        A MutationObserver resolves as soon as lazy-loaded reviews are attached, so the
+        scroll loop runs at network speed instead of sleeping a fixed interval.
+        Returns (landed, waited_ms); landed is False if no new card appeared within
+        timeout_ms, and waited_ms is how long the cards took to land. The reviews
+        themselves arrive through the review stream (see _stream_reviews).
+        """
+        try:
+            result = await page.evaluate(
+                "([selector, timeoutMs]) => window.__scrollAndWait(selector, timeoutMs)",
+                [REVIEW_CARD_SELECTOR, timeout_ms],
+            )
         except Exception as e:
-            logger.debug(f"Error scrolling: {e}")
+            logger.debug(f"Error scrolling for reviews: {e}")
+            return False, timeout_ms
+
+        logger.debug(f"Scrolled {result.get('scrolled')}: new cards landed={result.get('landed')}")
+        return bool(result.get('landed')), int(result.get('waitedMs') or 0)
 
     async def crawl_whats_new(
         self,
@@ -632,50 +1522,32 @@ class AppStoreBrowserCrawler:
             page = browser_page.page
 
             try:
-                await page.goto(reviews_url, wait_until='networkidle', timeout=60000)
-                await asyncio.sleep(3)
+                # networkidle can stall on the storefront's long-polling; wait for the section instead
+                await self._request_with_retry(
+                    reviews_url, lambda: page.goto(reviews_url, wait_until='domcontentloaded', timeout=20000)
+                )
+                try:
+                    await page.wait_for_selector(VERSION_HISTORY_SELECTOR, state='attached', timeout=8000)
+                except PlaywrightTimeout:
+                    logger.debug(f"No version section rendered for {app_id} in {country}")
 
                 # Try to find and click "Version History" link
                 try:
                     version_link = page.locator('a:has-text("Version History"), a[href*="version-history"]')
                     if await version_link.count() > 0:
+                        version_count = await page.locator('[class*="version"]').count()
                         await version_link.first.click()
-                        await asyncio.sleep(2)
+                        # The history modal adds version items; continue as soon as it has
+                        await page.wait_for_function(
+                            "([selector, before]) => document.querySelectorAll(selector).length > before",
+                            arg=['[class*="version"]', version_count],
+                            timeout=5000,
+                        )
                 except (PlaywrightTimeout, Exception) as e:
                     logger.debug(f"Version History link not found or not clickable: {e}")
 
                 # Extract version info from the page
-                versions_data = await page.evaluate("""
-                    () => {
-                        const versions = [];
-
-                        // Look for version history items
-                        const versionItems = document.querySelectorAll('[class*="version"]');
-
-                        versionItems.forEach(item => {
-                            const text = item.textContent.trim();
-                            // Try to parse version info
-                            const versionMatch = text.match(/Version\\s*([\\d.]+)/i);
-                            if (versionMatch) {
-                                versions.push({
-                                    version: versionMatch[1],
-                                    text: text.substring(0, 500)
-                                });
-                            }
-                        });
-
-                        // Also get current version from page
-                        const currentVersion = document.querySelector('[class*="version"]');
-                        if (currentVersion && versions.length === 0) {
-                            versions.push({
-                                version: currentVersion.textContent.trim(),
-                                text: 'Current version'
-                            });
-                        }
-
-                        return versions;
-                    }
-                """)
+                versions_data = await page.evaluate("() => window.__extractVersions()")
 
                 versions = versions_data[:max_versions]
                 logger.info(f"Found {len(versions)} version entries")
@@ -701,41 +1573,32 @@ class AppStoreBrowserCrawler:
             page = browser_page.page
 
             try:
-                await page.goto(app_url, wait_until='networkidle', timeout=60000)
-                await asyncio.sleep(3)
+                # networkidle can stall on the storefront's long-polling; wait for the section instead
+                await self._request_with_retry(
+                    app_url, lambda: page.goto(app_url, wait_until='domcontentloaded', timeout=20000)
+                )
+                try:
+                    await page.wait_for_selector(PRIVACY_SECTION_SELECTOR, state='attached', timeout=8000)
+                except PlaywrightTimeout:
+                    logger.debug(f"No privacy section rendered for {app_id} in {country}")
 
                 # Try to expand privacy section
                 try:
                     privacy_link = page.locator('a:has-text("See Details"), a:has-text("App Privacy")')
                     if await privacy_link.count() > 0:
+                        section_count = await page.locator(PRIVACY_SECTION_SELECTOR).count()
                         await privacy_link.first.click()
-                        await asyncio.sleep(2)
+                        # The details modal adds privacy sections; continue as soon as it has
+                        await page.wait_for_function(
+                            "([selector, before]) => document.querySelectorAll(selector).length > before",
+                            arg=[PRIVACY_SECTION_SELECTOR, section_count],
+                            timeout=5000,
+                        )
                 except (PlaywrightTimeout, Exception) as e:
                     logger.debug(f"Privacy section link not found or not clickable: {e}")
 
                 # Extract privacy info
-                labels_data = await page.evaluate("""
-                    () => {
-                        const labels = [];
-
-                        // Look for privacy-related sections
-                        const privacySections = document.querySelectorAll('[class*="privacy"], [class*="Privacy"]');
-
-                        privacySections.forEach(section => {
-                            const text = section.textContent.trim();
-                            if (text.length > 10 && text.length < 1000) {
-                                labels.push({
-                                    category: 'Privacy Information',
-                                    text: text.substring(0, 500),
-                                    data_types: [],
-                                    purposes: []
-                                });
-                            }
-                        });
-
-                        return labels;
-                    }
-                """)
+                labels_data = await page.evaluate("() => window.__extractPrivacy()")
 
                 labels = labels_data
                 logger.info(f"Found {len(labels)} privacy label sections")
@@ -744,3 +1607,30 @@ class AppStoreBrowserCrawler:
                 logger.error(f"Error crawling privacy labels: {e}")
 
         return labels
+
+    async def crawl_all(
+        self,
+        app_id: str,
+        country: str = "us",
+        max_reviews: int = 5000,
+    ) -> dict:
+        """
+        Crawl reviews, version history and privacy labels for an app concurrently.
+
+        Each crawl checks out its own browser page, so the three overlap their
+        page loads instead of running back to back. A crawl that raises is logged
+        and reported as an empty list rather than failing the others.
+        """
+        reviews, versions, labels = await asyncio.gather(
+            self.crawl_reviews(app_id, country, max_reviews),
+            self.crawl_whats_new(app_id, country),
+            self.crawl_privacy_labels(app_id, country),
+            return_exceptions=True,
+        )
+
+        results = {'reviews': reviews, 'versions': versions, 'privacy_labels': labels}
+        for name, value in results.items():
+            if isinstance(value, BaseException):
+                logger.error(f"Error crawling {name} for {app_id}: {value}")
+                results[name] = []
+        return results
@@ -11,14 +11,49 @@ import httpx
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 multiplexes concurrent requests to one host (RSS feeds, iTunes lookups) over a
+# single TLS connection; httpx only enables it when the h2 package is installed
+try:
+    import h2  # noqa: F401 - required by httpx for http2=True
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# Transport failures worth another attempt: the server dropped or timed out the exchange
+RETRYABLE_ERRORS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.ReadTimeout,
+    httpx.ReadError,
+    httpx.WriteError,
+    httpx.RemoteProtocolError,
+    httpx.PoolTimeout,
+)
+
+# Per-request read timeout for the shared client; the default retry budget scales from it
+REQUEST_TIMEOUT = 60.0
+
 
 class BaseCrawler:
     """Base class for all crawlers using httpx"""
 
-    def __init__(self, max_retries: int = 3, base_delay: float = 1.0):
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_concurrent: int = 10,
+        retry_budget: Optional[float] = None,
+    ):
         self.client: Optional[httpx.AsyncClient] = None
         self.max_retries = max_retries
         self.base_delay = base_delay
+        # Wall-clock cap on one fetch including every retry and backoff sleep. Defaults to a
+        # full client timeout per attempt so a slow but successful response is never cut short
+        self.retry_budget = retry_budget if retry_budget is not None else REQUEST_TIMEOUT * max_retries
+        self.max_concurrent = max_concurrent
+        # Bound in-flight requests so callers can gather many crawls on one instance safely
+        self._semaphore = asyncio.Semaphore(max_concurrent)
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
@@ -28,9 +63,16 @@ class BaseCrawler:
     async def __aenter__(self):
         self.client = httpx.AsyncClient(
             headers=self.headers,
-            timeout=httpx.Timeout(60.0, connect=10.0),
+            timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=10.0),
             follow_redirects=True,
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
+            http2=HTTP2_AVAILABLE,
+            # The semaphore already caps in-flight requests, so keep a socket alive for each
+            # slot rather than re-handshaking whenever more than 5 were busy
+            limits=httpx.Limits(
+                max_keepalive_connections=self.max_concurrent,
+                max_connections=self.max_concurrent,
+                keepalive_expiry=30.0,
+            ),
         )
         return self
 
@@ -39,38 +81,66 @@ class BaseCrawler:
             await self.client.aclose()
 
     async def _retry_with_backoff(self, coro_factory, url: str):
-        """Execute a coroutine with exponential backoff retry"""
+        """
+        Execute a coroutine with exponential backoff retry, within retry_budget seconds.
+
+        Each attempt holds a concurrency slot. The budget starts once the first slot
+        is acquired, so time queued behind other requests is not charged to it.
+        Attempts and backoff sleeps share the budget: an attempt is cut off when it
+        runs out, and a retry whose delay would overrun it is not started.
+        """
         last_exception = None
+        attempts = 0
+        loop = asyncio.get_running_loop()
+        deadline = None
 
         for attempt in range(self.max_retries):
             try:
-                return await coro_factory()
+                async with self._semaphore:
+                    if deadline is None:
+                        deadline = loop.time() + self.retry_budget
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    attempts += 1
+                    return await asyncio.wait_for(coro_factory(), timeout=remaining)
             except httpx.HTTPStatusError as e:
                 last_exception = e
                 if e.response.status_code == 429:
                     # Rate limited - wait longer
                     delay = self.base_delay * (2 ** attempt) + random.uniform(1, 3)
                     logger.warning(f"Rate limited on {url}, waiting {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
-                    await asyncio.sleep(delay)
                 elif e.response.status_code >= 500:
                     # Server error - retry with backoff
                     delay = self.base_delay * (2 ** attempt)
                     logger.warning(f"Server error {e.response.status_code} on {url}, retrying in {delay:.1f}s")
-                    await asyncio.sleep(delay)
                 else:
-                    # Client error (4xx except 429) - don't retry
+                    # Client error (4xx except 429, e.g. 404/410) - terminal, don't retry
                     logger.error(f"HTTP {e.response.status_code} error fetching {url}: {e}")
                     return None
-            except (httpx.ConnectError, httpx.ReadTimeout, httpx.ConnectTimeout) as e:
+            except RETRYABLE_ERRORS as e:
                 last_exception = e
                 delay = self.base_delay * (2 ** attempt)
                 logger.warning(f"Connection error on {url}, retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries}): {e}")
-                await asyncio.sleep(delay)
-            except Exception as e:
+            except asyncio.TimeoutError as e:
+                # Budget ran out mid-attempt; the deadline check below decides whether to retry
+                last_exception = e
+                delay = self.base_delay * (2 ** attempt)
+                logger.warning(f"Attempt on {url} timed out (attempt {attempt + 1}/{self.max_retries})")
+            except (httpx.HTTPError, httpx.InvalidURL, httpx.StreamError, ValueError) as e:
+                # Non-retryable transport errors, malformed URLs (e.g. hrefs scraped from a page)
+                # and undecodable bodies; anything else is a bug
                 logger.error(f"Unexpected error fetching {url}: {e}")
                 return None
 
-        logger.error(f"Failed to fetch {url} after {self.max_retries} attempts: {last_exception}")
+            if attempt == self.max_retries - 1:
+                break
+            if loop.time() + delay >= deadline:
+                logger.warning(f"Retry budget of {self.retry_budget:.0f}s exhausted for {url}")
+                break
+            await asyncio.sleep(delay)
+
+        logger.error(f"Failed to fetch {url} after {attempts} attempts: {last_exception!r}")
         return None
 
     async def fetch(self, url: str, extra_headers: Optional[dict] = None) -> Optional[str]:
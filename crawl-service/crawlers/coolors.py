@@ -6,11 +6,9 @@ Extracts hex codes from palette URLs and associates mood/style metadata
 import asyncio
 import json
 import logging
-import os
-import re
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict
 import random
 from playwright.async_api import async_playwright, Page, Browser, TimeoutError as PlaywrightTimeout
 
@@ -21,6 +19,18 @@ CACHE_DIR = Path(__file__).parent.parent / "data"
 PALETTE_CACHE_FILE = CACHE_DIR / "coolors_palettes.json"
 CACHE_MAX_AGE_HOURS = 24  # Refresh cache after 24 hours
 
+# Palettes are read from link hrefs and inline styles, so none of these are needed.
+# Stylesheets are kept: the infinite-scroll feed relies on layout to load more.
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font'})
+
+
+async def _block_heavy_resources(route):
+    """Abort requests for resource types the palette extractor never reads."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
 
 class ColorPalette:
     """Represents a color palette with metadata"""
@@ -167,6 +177,7 @@ class CoolorsCrawler:
             user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             locale='en-US',
         )
+        await context.route('**/*', _block_heavy_resources)
         page = await context.new_page()
 
         await page.add_init_script("""
@@ -201,23 +212,22 @@ class CoolorsCrawler:
 
         try:
             logger.info("Navigating to Coolors trending palettes...")
-            # Use 'load' instead of 'networkidle' - networkidle hangs on sites with
-            # continuous analytics/tracking activity. 15s timeout to fail fast.
+            # Use 'domcontentloaded' instead of 'networkidle'/'load' - networkidle hangs on
+            # sites with continuous analytics/tracking activity, and 'load' waits on every
+            # script and iframe. Readiness is the palette selector below. 15s to fail fast.
             await page.goto(
                 "https://coolors.co/palettes/trending",
-                wait_until='load',
+                wait_until='domcontentloaded',
                 timeout=15000
             )
 
-            # Wait for palette elements to appear (more reliable than fixed sleep)
+            # Wait for palette elements to appear (more reliable than fixed sleep); the
+            # budget also covers the scripts that 'load' used to wait for
             try:
-                await page.wait_for_selector('a[href*="/palette/"]', timeout=5000)
+                await page.wait_for_selector('a[href*="/palette/"]', timeout=10000)
             except PlaywrightTimeout:
                 logger.warning("Palette selector not found, continuing anyway...")
 
-            # Brief pause for any dynamic rendering
-            await asyncio.sleep(1)
-
             # Extract palettes from initial load first
             palettes = await self._extract_palettes(page)
             existing_colors = {tuple(p.colors) for p in palettes}
@@ -228,8 +238,20 @@ class CoolorsCrawler:
                 if len(palettes) >= max_palettes:
                     break
 
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await asyncio.sleep(1)  # Reduced from 2s
+                # Scroll and wait for more palette links to attach instead of sleeping
+                before = await page.evaluate(
+                    "() => { window.scrollTo(0, document.body.scrollHeight); "
+                    "return document.querySelectorAll('a[href*=\"/palette/\"]').length; }"
+                )
+                try:
+                    await page.wait_for_function(
+                        "(before) => document.querySelectorAll('a[href*=\"/palette/\"]').length > before",
+                        arg=before,
+                        timeout=3000,
+                    )
+                except PlaywrightTimeout:
+                    logger.debug(f"No new palettes after scroll {i + 1}")
+                    break
 
                 # Extract palettes after each scroll
                 new_palettes = await self._extract_palettes(page)
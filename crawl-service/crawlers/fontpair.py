@@ -14,7 +14,7 @@ import tempfile
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +23,12 @@ CACHE_DIR = Path(__file__).parent.parent / "data"
 FONTPAIR_CACHE_FILE = CACHE_DIR / "fontpair.json"
 CACHE_MAX_AGE_HOURS = 24  # Refresh cache after 24 hours
 
+# "Font1 + Font2", "Font1 & Font2", "Font1 / Font2", "Font1 with Font2", ...
+FONT_PAIR_RE = re.compile(
+    r'([A-Z][a-zA-Z\s]{1,50}?)\s*(?:[+&/]|with|and|\|)\s*([A-Z][a-zA-Z\s]{1,50})',
+    re.IGNORECASE,
+)
+
 
 class FontPairing:
     """Represents a font pairing suggestion"""
@@ -106,10 +112,7 @@ async def scrape_fontpair() -> List[FontPairing]:
                     # Limit input to prevent ReDoS
                     if len(text) > 500:
                         text = text[:500]
-                    pair_match = re.search(
-                        r'([A-Z][a-zA-Z\s]{1,50}?)\s*(?:[+&/]|with|and|\|)\s*([A-Z][a-zA-Z\s]{1,50})',
-                        text, re.IGNORECASE
-                    )
+                    pair_match = FONT_PAIR_RE.search(text)
 
                     if pair_match:
                         heading = pair_match.group(1).strip()
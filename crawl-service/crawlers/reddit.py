@@ -14,6 +14,9 @@ from .base import BaseCrawler
 
 logger = logging.getLogger(__name__)
 
+# r/subreddit mentions in sidebars and wikis
+SUBREDDIT_MENTION_RE = re.compile(r'r/([a-zA-Z0-9_]+)')
+
 
 class RedditCrawler(BaseCrawler):
     """Crawl Reddit discussions using public JSON endpoints"""
@@ -126,7 +129,7 @@ class RedditCrawler(BaseCrawler):
                 for text_field in ['public_description', 'description']:
                     text = about.get(text_field, '') or ''
                     # Find r/subredditname patterns
-                    matches = re.findall(r'r/([a-zA-Z0-9_]+)', text)
+                    matches = SUBREDDIT_MENTION_RE.findall(text)
                     discovered.update(matches)
         except Exception as e:
             logger.debug(f"Could not discover from sidebar of r/{seed_subreddit}: {e}")
@@ -138,7 +141,7 @@ class RedditCrawler(BaseCrawler):
 
             if wiki_data and 'data' in wiki_data:
                 content = wiki_data['data'].get('content_md', '') or ''
-                matches = re.findall(r'r/([a-zA-Z0-9_]+)', content)
+                matches = SUBREDDIT_MENTION_RE.findall(content)
                 discovered.update(matches)
         except Exception as e:
             logger.debug(f"Could not discover from wiki of r/{seed_subreddit}: {e}")
@@ -7,15 +7,18 @@ Inspired by uicolors.app but implemented locally for speed and reliability.
 
 import logging
 import re
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Compiled once at import; validated on every spectrum request
+HEX_COLOR_RE = re.compile(r'^[0-9A-Fa-f]{6}$')
+
 
 def hex_to_hsl(hex_color: str) -> Tuple[float, float, float]:
     """Convert hex color to HSL (Hue, Saturation, Lightness)"""
     hex_color = hex_color.lstrip('#')
-    if not re.match(r'^[0-9A-Fa-f]{6}$', hex_color):
+    if not HEX_COLOR_RE.match(hex_color):
         raise ValueError(f"Invalid hex color: {hex_color}")
     r, g, b = tuple(int(hex_color[i:i+2], 16) / 255 for i in (0, 2, 4))
 
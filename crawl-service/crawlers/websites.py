@@ -5,7 +5,7 @@ Website Crawler - Simplified version using httpx and BeautifulSoup
 import asyncio
 import logging
 import re
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
 
@@ -13,6 +13,20 @@ from .base import BaseCrawler
 
 logger = logging.getLogger(__name__)
 
+# Price patterns, compiled once at import
+PRICE_PATTERNS = (
+    re.compile(r'\$(\d+(?:\.\d{2})?)'),
+    re.compile(r'(\d+(?:\.\d{2})?)\s*(?:USD|EUR|GBP)'),
+)
+
+
+def _node_text(element) -> str:
+    """Stripped text of an element, skipping the descendant walk when it holds a single string."""
+    text = element.string
+    if text is not None:
+        return text.strip()
+    return element.get_text(strip=True)
+
 
 class WebsiteCrawler(BaseCrawler):
     """Crawl competitor websites for features, pricing, etc."""
@@ -50,32 +64,52 @@ class WebsiteCrawler(BaseCrawler):
         if not html:
             return result
 
-        soup = BeautifulSoup(html, "html.parser")
-        result.update(self._extract_page_info(soup, url))
+        # Parsing is CPU-bound; run it in a thread so other crawls keep progressing
+        page_data, pricing_urls = await asyncio.to_thread(
+            self._parse_main_page, html, url, base_domain, extract_features, extract_pricing
+        )
+        result.update(page_data)
         result["crawled_pages"] = 1
 
+        # Try to find and crawl pricing page
+        for pricing_url in pricing_urls[:1]:  # Only try first pricing link
+            pricing_html = await self.fetch(pricing_url)
+            if pricing_html:
+                result["pricing_info"] = await asyncio.to_thread(self._parse_pricing_page, pricing_html)
+                result["crawled_pages"] += 1
+                break
+            await asyncio.sleep(0.5)
+
+        return result
+
+    def _parse_main_page(
+        self,
+        html: str,
+        url: str,
+        base_domain: str,
+        extract_features: bool,
+        extract_pricing: bool,
+    ) -> Tuple[dict, List[str]]:
+        """Parse the main page HTML. Returns extracted fields and candidate pricing URLs."""
+        soup = BeautifulSoup(html, "html.parser")
+        data = self._extract_page_info(soup, url)
+
         if extract_features:
-            result["features"] = self._extract_features(soup)
-
-        if extract_pricing:
-            # Try to find and crawl pricing page
-            pricing_urls = self._find_pricing_links(soup, base_domain)
-            for pricing_url in pricing_urls[:1]:  # Only try first pricing link
-                pricing_html = await self.fetch(pricing_url)
-                if pricing_html:
-                    pricing_soup = BeautifulSoup(pricing_html, "html.parser")
-                    result["pricing_info"] = self._extract_pricing(pricing_soup)
-                    result["crawled_pages"] += 1
-                    break
-                await asyncio.sleep(0.5)
+            data["features"] = self._extract_features(soup)
+
+        pricing_urls = self._find_pricing_links(soup, base_domain) if extract_pricing else []
 
         # Extract testimonials
-        result["testimonials"] = self._extract_testimonials(soup)
+        data["testimonials"] = self._extract_testimonials(soup)
 
         # Extract social links
-        result["social_links"] = self._extract_social_links(soup)
+        data["social_links"] = self._extract_social_links(soup)
 
-        return result
+        return data, pricing_urls
+
+    def _parse_pricing_page(self, html: str) -> Optional[dict]:
+        """Parse a pricing page's HTML and extract pricing information."""
+        return self._extract_pricing(BeautifulSoup(html, "html.parser"))
 
     def _extract_page_info(self, soup: BeautifulSoup, url: str) -> dict:
         """Extract basic page information"""
@@ -123,7 +157,7 @@ class WebsiteCrawler(BaseCrawler):
         for selector in feature_selectors:
             items = soup.select(selector)
             for item in items[:20]:
-                text = item.get_text(strip=True)
+                text = _node_text(item)
                 if text and len(text) > 5 and len(text) < 200:
                     features.append(text)
 
@@ -136,7 +170,7 @@ class WebsiteCrawler(BaseCrawler):
 
         for link in soup.find_all("a", href=True):
             href = link.get("href", "")
-            text = link.get_text(strip=True).lower()
+            text = _node_text(link).lower()
 
             if any(word in text for word in ["pricing", "plans", "price"]) or \
                any(word in href.lower() for word in ["pricing", "plans", "price"]):
@@ -154,17 +188,12 @@ class WebsiteCrawler(BaseCrawler):
         }
 
         # Look for pricing cards/tables
-        price_patterns = [
-            r'\$(\d+(?:\.\d{2})?)',
-            r'(\d+(?:\.\d{2})?)\s*(?:USD|EUR|GBP)',
-        ]
-
         price_containers = soup.select("[class*='price'], [class*='plan'], [class*='tier']")
 
         for container in price_containers[:5]:
             text = container.get_text(separator=" ", strip=True)
-            for pattern in price_patterns:
-                matches = re.findall(pattern, text)
+            for pattern in PRICE_PATTERNS:
+                matches = pattern.findall(text)
                 if matches:
                     pricing["plans"].append({
                         "text": text[:200],
@@ -188,7 +217,7 @@ class WebsiteCrawler(BaseCrawler):
         for selector in selectors:
             items = soup.select(selector)
             for item in items[:5]:
-                text = item.get_text(strip=True)
+                text = _node_text(item)
                 if text and len(text) > 20 and len(text) < 500:
                     testimonials.append(text)
 
@@ -9,16 +9,14 @@ FastAPI service providing crawling capabilities for:
 """
 
 import asyncio
-import hashlib
 import logging
 import os
-import re
 import time
-import uuid
 from collections import defaultdict
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Optional
+from itertools import islice
+from typing import Awaitable, Callable, Optional
 
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
@@ -34,7 +32,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 load_dotenv()
 
 # Crawlers
-from crawlers.app_store import AppStoreCrawler
+from crawlers.app_store import AppStoreCrawler, invalidate_cached_lookup, parse_star_rating
 from crawlers.app_store_browser import AppStoreBrowserCrawler
 from crawlers.reddit import RedditCrawler
 from crawlers.websites import WebsiteCrawler
@@ -53,10 +51,12 @@ from crawlers.fontpair import (
     select_pairings_for_style,
 )
 from crawlers.uicolors import (
+    HEX_COLOR_RE,
     generate_color_system,
     generate_complementary_colors,
     format_color_system_for_prompt,
 )
+from utils.dedup import review_fingerprint, review_key
 
 # Supabase client for async review saving
 try:
@@ -66,6 +66,15 @@ except ImportError:
     SUPABASE_AVAILABLE = False
     logger.warning("Supabase package not installed - async review saving will be disabled")
 
+# orjson serializes large review payloads several times faster than stdlib json
+try:
+    import orjson  # noqa: F401 - required by ORJSONResponse
+    from fastapi.responses import ORJSONResponse as DefaultJSONResponse
+    ORJSON_AVAILABLE = True
+except ImportError:
+    DefaultJSONResponse = JSONResponse
+    ORJSON_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(
     level=os.getenv("LOG_LEVEL", "INFO"),
@@ -155,7 +164,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         # Use client IP as identifier (or X-Forwarded-For if behind proxy)
         client_ip = request.headers.get("X-Forwarded-For", request.client.host if request.client else "unknown")
         # Take first IP if multiple are present
-        client_ip = client_ip.split(",")[0].strip()
+        client_ip = client_ip.partition(",")[0].strip()
 
         allowed, retry_after = await rate_limiter.is_allowed(client_ip)
 
@@ -362,6 +371,7 @@ app = FastAPI(
     description="Web scraping service with browser automation for unlimited App Store reviews",
     version="3.0.0",
     lifespan=lifespan,
+    default_response_class=DefaultJSONResponse,
 )
 
 # CORS middleware - restrict origins for security
@@ -397,6 +407,124 @@ async def health_check():
 # App Store Endpoints
 # ============================================================================
 
+# Per-tier time budgets for review collection, cheapest tier first
+RSS_TIER_TIMEOUT = 120.0  # 2 minute max for RSS phase
+BROWSER_TIER_TIMEOUT = 480.0  # 8 minutes max for browser phase (40s per country * 12 countries)
+# Countries scraped in parallel by the browser tier, each in its own browser context
+BROWSER_MAX_CONCURRENT_COUNTRIES = int(os.getenv("BROWSER_MAX_CONCURRENT_COUNTRIES", "6"))
+
+
+def _merge_tier_reviews(all_reviews: dict, reviews: list, source: str, log_prefix: str = "") -> int:
+    """
+    Add a tier's reviews to all_reviews keyed by review_key. Returns the number added.
+
+    Plain function over plain data so it can run in a worker thread; callers must
+    not touch all_reviews until it returns.
+    """
+    added = 0
+    for review in reviews:
+        if not isinstance(review, dict):
+            logger.warning(f"{log_prefix}Skipping non-dict review from {source}: {type(review).__name__}")
+            continue
+        # Deterministic hash for deduplication (not Python's randomized hash())
+        review_id = review_key(review.get('author', ''), review.get('content', ''))
+        if review_id not in all_reviews:
+            review['source'] = source
+            all_reviews[review_id] = review
+            added += 1
+    return added
+
+
+async def collect_app_store_reviews(
+    app_id: str,
+    country: str,
+    max_reviews: int,
+    min_rating: Optional[int] = None,
+    max_rating: Optional[int] = None,
+    multi_country: bool = True,
+    log_prefix: str = "",
+    on_progress: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> dict:
+    """
+    Collect App Store reviews through tiered sources, cheapest first.
+
+    1. iTunes RSS JSON feed - fast, but limited to ~500 reviews per country
+    2. Browser multi-country scraping - only for the reviews still missing
+
+    Each tier has its own timeout; a tier that fails or times out falls through
+    to the next instead of failing the request. Returns reviews keyed by
+    review_key (an in-memory blake2b key, not the persisted id), in collection order.
+    on_progress, if given, is awaited with a status message between tiers so
+    callers can surface partial counts before the slow browser tier finishes.
+    """
+    all_reviews = {}
+
+    logger.info(f"{log_prefix}Phase 1: RSS API scraping (limited to ~500 reviews per country)...")
+    # Filled as reviews stream in, so a timeout keeps the pages already parsed
+    rss_reviews = []
+    try:
+        async with AppStoreCrawler() as crawler:
+            async def drain_rss_reviews():
+                async for review in crawler.iter_reviews(
+                    app_id=app_id,
+                    country=country,
+                    max_reviews=min(max_reviews, 2000),
+                    min_rating=min_rating,
+                    max_rating=max_rating,
+                ):
+                    rss_reviews.append(review)
+
+            await asyncio.wait_for(drain_rss_reviews(), timeout=RSS_TIER_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning(f"{log_prefix}RSS API scraping timed out after {RSS_TIER_TIMEOUT:.0f} seconds, keeping {len(rss_reviews)} reviews")
+    except Exception as e:
+        logger.error(f"{log_prefix}RSS API scraping failed: {e}")
+
+    # Hashing a whole tier (thousands of reviews) runs off the event loop so other
+    # requests' crawls keep making progress
+    await asyncio.to_thread(_merge_tier_reviews, all_reviews, rss_reviews, 'rss_api', log_prefix)
+    logger.info(f"{log_prefix}RSS API Phase Complete: collected {len(all_reviews)} reviews")
+
+    if len(all_reviews) >= max_reviews:
+        logger.info(f"{log_prefix}Skipping browser phase - RSS API met target")
+        return all_reviews
+
+    remaining = max_reviews - len(all_reviews)
+    logger.info(f"{log_prefix}Phase 2: Browser scraping for {remaining} more reviews (RSS API has fundamental limits)...")
+    if on_progress:
+        await on_progress(f"Collected {len(all_reviews)} reviews from RSS, browser scraping for {remaining} more...")
+    # Filled as reviews stream in, so a timeout keeps what the countries already found
+    browser_reviews = []
+    try:
+        async with AppStoreBrowserCrawler(
+            headless=True, max_concurrent_countries=BROWSER_MAX_CONCURRENT_COUNTRIES
+        ) as crawler:
+            async def drain_browser_reviews():
+                async for review in crawler.iter_reviews(
+                    app_id=app_id,
+                    country=country,
+                    max_reviews=remaining,
+                    min_rating=min_rating,
+                    max_rating=max_rating,
+                    multi_country=multi_country,
+                ):
+                    browser_reviews.append(review)
+
+            await asyncio.wait_for(drain_browser_reviews(), timeout=BROWSER_TIER_TIMEOUT)
+            logger.info(f"{log_prefix}Browser scraping returned {len(browser_reviews)} reviews")
+    except asyncio.TimeoutError:
+        logger.warning(f"{log_prefix}Browser scraping timed out, keeping {len(browser_reviews)} reviews collected so far")
+    except Exception as e:
+        logger.error(f"{log_prefix}Browser scraping error: {e}")
+
+    new_from_browser = await asyncio.to_thread(
+        _merge_tier_reviews, all_reviews, browser_reviews, 'browser', log_prefix
+    )
+    logger.info(f"{log_prefix}Browser Phase Complete: added {new_from_browser} unique reviews (total: {len(all_reviews)})")
+
+    return all_reviews
+
+
 @app.post("/crawl/app-store/reviews")
 async def crawl_app_store_reviews(request: AppStoreReviewRequest):
     """
@@ -409,104 +537,36 @@ async def crawl_app_store_reviews(request: AppStoreReviewRequest):
     """
     logger.info(f"Crawling reviews for app {request.app_id} - target: {request.max_reviews}")
 
-    all_reviews = {}
-
     try:
-        # Step 1: RSS API - fast, but limited to ~500 reviews per country
-        logger.info("Phase 1: RSS API scraping (limited to ~500 reviews per country)...")
-        try:
-            async with AppStoreCrawler() as crawler:
-                # Timeout RSS phase after 120 seconds
-                rss_reviews = await asyncio.wait_for(
-                    crawler.crawl_reviews(
-                        app_id=request.app_id,
-                        country=request.country,
-                        max_reviews=min(request.max_reviews, 2000),
-                        min_rating=request.min_rating,
-                        max_rating=request.max_rating,
-                    ),
-                    timeout=120.0  # 2 minute max for RSS phase
-                )
-        except asyncio.TimeoutError:
-            logger.warning("RSS API scraping timed out after 120 seconds")
-            rss_reviews = []
-        except Exception as e:
-            logger.error(f"RSS API scraping failed: {e}")
-            rss_reviews = []
-
-        # Add RSS reviews to collection using deterministic hash (not Python's randomized hash())
-        for review in rss_reviews:
-            if not isinstance(review, dict):
-                logger.warning(f"Skipping non-dict review from RSS: {type(review).__name__}")
-                continue
-            content_key = f"{review.get('author', '')}:{review.get('content', '')[:100]}"
-            review_id = hashlib.sha256(content_key.encode()).hexdigest()[:16]
-            review['source'] = 'rss_api'
-            all_reviews[review_id] = review
-
-        logger.info(f"RSS API Phase Complete: collected {len(all_reviews)} reviews")
-
-        # Step 2: Browser multi-country - ALWAYS try if we need more reviews
-        if len(all_reviews) < request.max_reviews:
-            remaining = request.max_reviews - len(all_reviews)
-            logger.info(f"Phase 2: Browser scraping for {remaining} more reviews (RSS API has fundamental limits)...")
-
-            try:
-                async with AppStoreBrowserCrawler(headless=True) as crawler:
-                    # Timeout browser scraping after 8 minutes (40s per country * 12 countries)
-                    browser_reviews = await asyncio.wait_for(
-                        crawler.crawl_reviews(
-                            app_id=request.app_id,
-                            country=request.country,
-                            max_reviews=remaining,
-                            min_rating=request.min_rating,
-                            max_rating=request.max_rating,
-                            multi_country=request.multi_country,
-                        ),
-                        timeout=480.0  # 8 minutes max for browser phase
-                    )
-                    logger.info(f"Browser scraping returned {len(browser_reviews)} reviews")
-            except asyncio.TimeoutError:
-                logger.warning(f"Browser scraping timed out after 8 minutes, proceeding with {len(all_reviews)} reviews from RSS")
-                browser_reviews = []
-            except Exception as e:
-                logger.error(f"Browser scraping error: {e}")
-                browser_reviews = []
-
-            # Add browser reviews, deduplicating by content using deterministic hash
-            new_from_browser = 0
-            for review in browser_reviews:
-                if not isinstance(review, dict):
-                    logger.warning(f"Skipping non-dict review from browser: {type(review).__name__}")
-                    continue
-                content_key = f"{review.get('author', '')}:{review.get('content', '')[:100]}"
-                review_id = hashlib.sha256(content_key.encode()).hexdigest()[:16]
-                if review_id not in all_reviews:
-                    review['source'] = 'browser'
-                    all_reviews[review_id] = review
-                    new_from_browser += 1
-
-            logger.info(f"Browser Phase Complete: added {new_from_browser} unique reviews (total: {len(all_reviews)})")
-        else:
-            logger.info("Skipping browser phase - RSS API met target")
+        all_reviews = await collect_app_store_reviews(
+            app_id=request.app_id,
+            country=request.country,
+            max_reviews=request.max_reviews,
+            min_rating=request.min_rating,
+            max_rating=request.max_rating,
+            multi_country=request.multi_country,
+        )
 
-        reviews = list(all_reviews.values())[:request.max_reviews]
+        # collect_app_store_reviews only stores dicts, so take the first max_reviews
+        # directly instead of copying the whole collection and re-filtering it
+        reviews = list(islice(all_reviews.values(), request.max_reviews))
 
-        # Calculate stats (filter to dicts only for safety)
-        reviews = [r for r in reviews if isinstance(r, dict)]
-        rss_count = len([r for r in reviews if r.get('source') == 'rss_api'])
-        browser_count = len([r for r in reviews if r.get('source') == 'browser'])
+        # Calculate stats
+        rss_count = sum(1 for r in reviews if r.get('source') == 'rss_api')
+        browser_count = sum(1 for r in reviews if r.get('source') == 'browser')
 
         if reviews:
             ratings = [r["rating"] for r in reviews if r.get("rating")]
             if ratings:
+                # Single pass tally indexed by star rating, converted to string keys once
+                rating_counts = [0] * 6
+                for rating in ratings:
+                    if rating in range(1, 6):
+                        rating_counts[int(rating)] += 1
                 stats = {
                     "total": len(reviews),
                     "average_rating": round(sum(ratings) / len(ratings), 2),
-                    "rating_distribution": {
-                        str(i): len([r for r in ratings if r == i])
-                        for i in range(1, 6)
-                    },
+                    "rating_distribution": {str(i): rating_counts[i] for i in range(1, 6)},
                     "sources": {
                         "rss_api": rss_count,
                         "browser_multi_country": browser_count,
@@ -563,96 +623,35 @@ async def run_scrape_and_update_supabase(request: AppStoreReviewAsyncRequest):
             "progress": {"message": "Starting scrape..."},
         }).eq("id", request.session_id).execute()
 
-        all_reviews = {}
-
-        # Phase 1: RSS API scraping
-        logger.info(f"[{request.session_id}] Phase 1: RSS API scraping...")
-        try:
-            async with AppStoreCrawler() as crawler:
-                rss_reviews = await asyncio.wait_for(
-                    crawler.crawl_reviews(
-                        app_id=request.app_id,
-                        country=request.country,
-                        max_reviews=min(request.max_reviews, 2000),
-                    ),
-                    timeout=120.0
-                )
-        except asyncio.TimeoutError:
-            logger.warning(f"[{request.session_id}] RSS API timed out")
-            rss_reviews = []
-        except Exception as e:
-            logger.error(f"[{request.session_id}] RSS API error: {e}")
-            rss_reviews = []
-
-        # Add RSS reviews to collection
-        for review in rss_reviews:
-            if not isinstance(review, dict):
-                continue
-            content_key = f"{review.get('author', '')}:{review.get('content', '')[:100]}"
-            review_id = hashlib.sha256(content_key.encode()).hexdigest()[:16]
-            review['source'] = 'rss_api'
-            all_reviews[review_id] = review
-
-        logger.info(f"[{request.session_id}] RSS phase complete: {len(all_reviews)} reviews")
-
-        # Phase 2: Browser scraping if needed
-        if len(all_reviews) < request.max_reviews:
-            remaining = request.max_reviews - len(all_reviews)
-            logger.info(f"[{request.session_id}] Phase 2: Browser scraping for {remaining} more...")
-
+        async def report_progress(message: str) -> None:
+            # Sync Supabase client; keep the blocking round-trip off the event loop
             try:
-                async with AppStoreBrowserCrawler(headless=True) as crawler:
-                    browser_reviews = await asyncio.wait_for(
-                        crawler.crawl_reviews(
-                            app_id=request.app_id,
-                            country=request.country,
-                            max_reviews=remaining,
-                            multi_country=True,
-                        ),
-                        timeout=480.0
-                    )
-            except asyncio.TimeoutError:
-                logger.warning(f"[{request.session_id}] Browser scraping timed out")
-                browser_reviews = []
+                await asyncio.to_thread(
+                    supabase.table("review_scrape_sessions").update({
+                        "progress": {"message": message},
+                    }).eq("id", request.session_id).execute
+                )
             except Exception as e:
-                logger.error(f"[{request.session_id}] Browser scraping error: {e}")
-                browser_reviews = []
-
-            # Add browser reviews
-            for review in browser_reviews:
-                if not isinstance(review, dict):
-                    continue
-                content_key = f"{review.get('author', '')}:{review.get('content', '')[:100]}"
-                review_id = hashlib.sha256(content_key.encode()).hexdigest()[:16]
-                if review_id not in all_reviews:
-                    review['source'] = 'browser'
-                    all_reviews[review_id] = review
-
-            logger.info(f"[{request.session_id}] Browser phase complete: {len(all_reviews)} total reviews")
-
-        # Format reviews for Supabase
-        reviews = list(all_reviews.values())[:request.max_reviews]
-        reviews = [r for r in reviews if isinstance(r, dict)]
+                logger.warning(f"[{request.session_id}] Failed to update progress: {e}")
+
+        all_reviews = await collect_app_store_reviews(
+            app_id=request.app_id,
+            country=request.country,
+            max_reviews=request.max_reviews,
+            log_prefix=f"[{request.session_id}] ",
+            on_progress=report_progress,
+        )
 
+        # Format reviews for Supabase in a single pass. Row ids use review_fingerprint
+        # (truncated SHA-256), matching ids already stored and generateReviewId in route.ts
         formatted_reviews = []
-        for r in reviews:
-            raw_rating = r.get('rating')
-            rating = None
-            if raw_rating is not None:
-                try:
-                    num_rating = float(raw_rating)
-                    if 1 <= num_rating <= 5:
-                        rating = int(num_rating)
-                except (ValueError, TypeError):
-                    pass
-
+        for r in islice(all_reviews.values(), request.max_reviews):
+            rating = parse_star_rating(r.get('rating'))
             author = str(r.get('author', 'Anonymous'))
             content = str(r.get('content', r.get('text', '')))
-            content_key = f"{author}:{content[:100]}"
-            review_id = f"review-{hashlib.sha256(content_key.encode()).hexdigest()[:16]}"
 
             formatted_reviews.append({
-                "id": review_id,
+                "id": f"review-{review_fingerprint(author, content)}",
                 "author": author,
                 "rating": rating,
                 "title": str(r.get('title', '')),
@@ -662,17 +661,19 @@ async def run_scrape_and_update_supabase(request: AppStoreReviewAsyncRequest):
                 "vote_sum": int(r.get('vote_sum', 0) or 0),
                 "country": str(r.get('country', request.country)),
                 "sort_source": str(r.get('sort_source', 'mostRecent')),
-                "date": str(r.get('date', r.get('dateISO', ''))),
+                "date": str(r.get('date', '')),
             })
 
         # Calculate stats
         valid_ratings = [r['rating'] for r in formatted_reviews if r['rating'] is not None]
         avg_rating = sum(valid_ratings) / len(valid_ratings) if valid_ratings else 0
 
-        rating_distribution = {'1': 0, '2': 0, '3': 0, '4': 0, '5': 0, 'null': 0}
+        # Slot 0 counts reviews without a rating; ratings are already normalized to 1-5
+        rating_counts = [0] * 6
         for r in formatted_reviews:
-            key = str(r['rating']) if r['rating'] is not None else 'null'
-            rating_distribution[key] = rating_distribution.get(key, 0) + 1
+            rating_counts[r['rating'] or 0] += 1
+        rating_distribution = {str(i): rating_counts[i] for i in range(1, 6)}
+        rating_distribution['null'] = rating_counts[0]
 
         stats = {
             "total": len(formatted_reviews),
@@ -748,6 +749,17 @@ async def crawl_app_store_privacy(app_id: str, country: str = "us"):
         raise HTTPException(status_code=500, detail=f"Failed to crawl privacy labels: {str(e)}")
 
 
+@app.post("/crawl/app-store/invalidate")
+async def invalidate_app_store_cache(app_id: str):
+    """Drop cached iTunes lookup data for an app, e.g. from an app-updated webhook."""
+    removed = invalidate_cached_lookup(app_id)
+    logger.info(f"Invalidated {removed} cached lookup records for app {app_id}")
+    return {
+        "app_id": app_id,
+        "invalidated": removed,
+    }
+
+
 # ============================================================================
 # Reddit Endpoints
 # ============================================================================
@@ -1047,7 +1059,7 @@ async def generate_spectrum(request: ColorSpectrumRequest):
         hex_color = request.primary_hex
         if hex_color.startswith('#'):
             hex_color = hex_color[1:]
-        if not re.match(r'^[0-9A-Fa-f]{6}$', hex_color):
+        if not HEX_COLOR_RE.match(hex_color):
             raise HTTPException(status_code=400, detail="Invalid hex color. Must be 6 hex characters (0-9, A-F)")
 
         color_system = generate_color_system(hex_color)
@@ -2,5 +2,6 @@
 
 from .rate_limiter import RateLimiter
 from .cache import CacheManager
+from .dedup import review_fingerprint, review_key
 
-__all__ = ["RateLimiter", "CacheManager"]
+__all__ = ["RateLimiter", "CacheManager", "review_fingerprint", "review_key"]
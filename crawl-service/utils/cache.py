@@ -66,7 +66,8 @@ class CacheManager:
         if params:
             # Sort params for consistent hashing
             sorted_params = json.dumps(params, sort_keys=True)
-            params_hash = hashlib.md5(sorted_params.encode()).hexdigest()[:8]
+            # 4-byte blake2b digest is natively 8 hex chars - no hexdigest()[:8] truncation
+            params_hash = hashlib.blake2b(sorted_params.encode(), digest_size=4).hexdigest()
             key_parts.append(params_hash)
 
         return ":".join(key_parts)
@@ -0,0 +1,55 @@
+"""Stable review ids and dedup keys for cross-source deduplication."""
+
+import hashlib
+
+# Reviews are matched on a content prefix so the same review dedupes across
+# sources even when one of them truncates the body (browser caps at 5000 chars)
+DEDUP_PREFIX_CHARS = 100
+
+# Initialised once; copying this state is cheaper than re-running the blake2b
+# constructor (argument parsing + parameter block setup) for every review
+_KEY_BASE = hashlib.blake2b(digest_size=8)
+
+
+def _key_hash(author: str, content: str) -> hashlib.blake2b:
+    """
+    Hash "{author}:{content prefix}" by feeding the parts to blake2b in turn.
+
+    Produces the same digest as hashing the joined string, without building the
+    f-string and its encoded copy first.
+    """
+    h = _KEY_BASE.copy()
+    h.update(author.encode())
+    h.update(b":")
+    h.update(content[:DEDUP_PREFIX_CHARS].encode())
+    return h
+
+
+def review_fingerprint(author: str, content: str) -> str:
+    """
+    Return the persisted 16-hex-char fingerprint for a review.
+
+    Truncated SHA-256 of "{author}:{content prefix}". This is the id format
+    already stored in review_scrape_sessions and produced by generateReviewId
+    in app/api/py-reviews/route.ts, so it must not change without a migration.
+
+    Args:
+        author: Review author name
+        content: Review body text
+
+    Returns:
+        Hex fingerprint used as the persisted review id suffix
+    """
+    content_key = f"{author}:{content[:DEDUP_PREFIX_CHARS]}"
+    return hashlib.sha256(content_key.encode()).hexdigest()[:16]
+
+
+def review_key(author: str, content: str) -> int:
+    """
+    Return a 64-bit blake2b key for a review, for in-memory dedup sets/dicts.
+
+    Deterministic across processes (unlike the salted builtin hash()) and
+    cheaper than review_fingerprint. It is NOT the persisted id: never store or
+    return it, use review_fingerprint for that.
+    """
+    return int.from_bytes(_key_hash(author, content).digest(), "big")
@@ -65,11 +65,22 @@ class RateLimiter:
         while requests and requests[0] < cutoff:
             requests.popleft()
 
+    def _window_wait(self, requests: deque[datetime], limit: int) -> float:
+        """Seconds until a sliding window has room for another request (0 if it has now)."""
+        self._clean_old_requests(requests)
+        if len(requests) < limit:
+            return 0.0
+        wait_until = requests[0] + timedelta(seconds=60)
+        # A window entry about to expire still needs a moment; never spin on 0
+        return max((wait_until - datetime.utcnow()).total_seconds(), 0.01)
+
     async def acquire(self, url: str) -> None:
         """
         Acquire permission to make a request.
 
-        Will block if rate limits are exceeded.
+        Will block if rate limits are exceeded. Waits are computed under _lock but
+        slept outside it, so a host that is backed off or has filled its window
+        doesn't stall requests to other hosts (or backoff() calls) behind the lock.
 
         Args:
             url: The URL being requested (for per-domain limiting)
@@ -77,67 +88,50 @@ class RateLimiter:
         domain = self._extract_domain(url)
 
         # Check backoff
-        async with self._lock:
-            if domain in self._backoff_until:
-                backoff_time = self._backoff_until[domain]
-                if datetime.utcnow() < backoff_time:
-                    wait_seconds = (backoff_time - datetime.utcnow()).total_seconds()
-                    logger.info(f"Backing off for {domain}: {wait_seconds:.1f}s remaining")
-                    await asyncio.sleep(wait_seconds)
-                del self._backoff_until[domain]
+        while True:
+            async with self._lock:
+                backoff_time = self._backoff_until.get(domain)
+                if backoff_time is None:
+                    break
+                wait_seconds = (backoff_time - datetime.utcnow()).total_seconds()
+                if wait_seconds <= 0:
+                    del self._backoff_until[domain]
+                    break
+            logger.info(f"Backing off for {domain}: {wait_seconds:.1f}s remaining")
+            await asyncio.sleep(wait_seconds)
 
         # Acquire semaphore for concurrent limiting
         await self._semaphore.acquire()
 
         try:
-            async with self._lock:
-                # Clean old requests
-                self._clean_old_requests(self._global_requests)
-
-                # Check global limit
-                while len(self._global_requests) >= self.requests_per_minute:
-                    # Calculate wait time
-                    oldest = self._global_requests[0]
-                    wait_until = oldest + timedelta(seconds=60)
-                    wait_seconds = (wait_until - datetime.utcnow()).total_seconds()
-
+            while True:
+                async with self._lock:
+                    # Check global limit
+                    wait_seconds = self._window_wait(self._global_requests, self.requests_per_minute)
                     if wait_seconds > 0:
                         logger.debug(f"Global rate limit: waiting {wait_seconds:.1f}s")
-                        await asyncio.sleep(wait_seconds)
-
-                    self._clean_old_requests(self._global_requests)
-
-                # Check per-domain limit
-                if domain in self.per_domain_rpm:
-                    if domain not in self._domain_requests:
-                        self._domain_requests[domain] = deque()
-
-                    domain_requests = self._domain_requests[domain]
-                    self._clean_old_requests(domain_requests)
-
-                    domain_limit = self.per_domain_rpm[domain]
-                    while len(domain_requests) >= domain_limit:
-                        oldest = domain_requests[0]
-                        wait_until = oldest + timedelta(seconds=60)
-                        wait_seconds = (wait_until - datetime.utcnow()).total_seconds()
-
+                    # Check per-domain limit
+                    elif domain in self.per_domain_rpm:
+                        domain_requests = self._domain_requests.setdefault(domain, deque())
+                        wait_seconds = self._window_wait(domain_requests, self.per_domain_rpm[domain])
                         if wait_seconds > 0:
                             logger.debug(f"Domain rate limit ({domain}): waiting {wait_seconds:.1f}s")
-                            await asyncio.sleep(wait_seconds)
 
-                        self._clean_old_requests(domain_requests)
+                    if wait_seconds <= 0:
+                        # Record this request
+                        now = datetime.utcnow()
+                        self._global_requests.append(now)
+                        if domain in self.per_domain_rpm:
+                            self._domain_requests[domain].append(now)
+                        return
 
-                # Record this request
-                now = datetime.utcnow()
-                self._global_requests.append(now)
+                await asyncio.sleep(wait_seconds)
 
-                if domain in self.per_domain_rpm:
-                    if domain not in self._domain_requests:
-                        self._domain_requests[domain] = deque()
-                    self._domain_requests[domain].append(now)
-
-        finally:
-            pass  # Keep semaphore acquired - release() must be called
+        except BaseException:
+            # Cancelled or failed while waiting on a window - give the slot back so the
+            # limiter doesn't shrink; on success it stays held until release()
+            self._semaphore.release()
+            raise
 
     def release(self) -> None:
         """Release the concurrent request slot."""
@@ -182,28 +176,33 @@ class DomainRateLimiter:
         """Acquire permission to make a request."""
         await self._semaphore.acquire()
 
-        async with self._lock:
-            # Clean old requests
-            cutoff = datetime.utcnow() - timedelta(seconds=60)
-            while self._requests and self._requests[0] < cutoff:
-                self._requests.popleft()
-
-            # Wait if needed
-            while len(self._requests) >= self.rpm:
-                oldest = self._requests[0]
-                wait_until = oldest + timedelta(seconds=60)
-                wait_seconds = max(0, (wait_until - datetime.utcnow()).total_seconds())
-
-                if wait_seconds > 0:
-                    await asyncio.sleep(wait_seconds)
-
-                # Clean again
+        try:
+            async with self._lock:
+                # Clean old requests
                 cutoff = datetime.utcnow() - timedelta(seconds=60)
                 while self._requests and self._requests[0] < cutoff:
                     self._requests.popleft()
 
-            # Record request
-            self._requests.append(datetime.utcnow())
+                # Wait if needed
+                while len(self._requests) >= self.rpm:
+                    oldest = self._requests[0]
+                    wait_until = oldest + timedelta(seconds=60)
+                    wait_seconds = max(0, (wait_until - datetime.utcnow()).total_seconds())
+
+                    if wait_seconds > 0:
+                        await asyncio.sleep(wait_seconds)
+
+                    # Clean again
+                    cutoff = datetime.utcnow() - timedelta(seconds=60)
+                    while self._requests and self._requests[0] < cutoff:
+                        self._requests.popleft()
+
+                # Record request
+                self._requests.append(datetime.utcnow())
+        except BaseException:
+            # Same as RateLimiter.acquire: don't leak the slot on cancellation
+            self._semaphore.release()
+            raise
 
     def release(self) -> None:
         """Release concurrent slot."""
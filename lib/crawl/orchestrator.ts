@@ -256,18 +256,44 @@ export class CrawlOrchestrator {
 
     const enrichmentParts: string[] = [];
 
-    // Fetch reviews in parallel
-    if (includeReviews && appStoreIds && appStoreIds.length > 0) {
-      const reviewPromises = appStoreIds.slice(0, 5).map(appId =>
-        this.crawlAppReviews({
-          app_id: appId,
-          country,
-          max_reviews: maxReviewsPerApp,
-          force_refresh: forceRefresh,
-        })
-      );
-
-      const reviewResults = await Promise.all(reviewPromises);
+    // Reviews, Reddit and websites are independent crawls, so start them all before
+    // awaiting any; total wait is the slowest source rather than the sum
+    const wantReviews = includeReviews && appStoreIds && appStoreIds.length > 0;
+    const wantReddit = includeReddit && keywords && keywords.length > 0;
+    const wantWebsites = includeWebsites && competitorUrls && competitorUrls.length > 0;
+
+    const [reviewResults, redditResponse, websiteResults] = await Promise.all([
+      wantReviews
+        ? Promise.all(appStoreIds.slice(0, 5).map(appId =>
+            this.crawlAppReviews({
+              app_id: appId,
+              country,
+              max_reviews: maxReviewsPerApp,
+              force_refresh: forceRefresh,
+            })
+          ))
+        : null,
+      wantReddit
+        ? this.crawlReddit({
+            keywords,
+            max_posts: maxRedditPosts,
+            max_comments_per_post: 10,
+            force_refresh: forceRefresh,
+          })
+        : null,
+      wantWebsites
+        ? Promise.all(competitorUrls.slice(0, 3).map(url =>
+            this.crawlWebsite({
+              url,
+              max_pages: 5,
+              force_refresh: forceRefresh,
+            })
+          ))
+        : null,
+    ]);
+
+    // App reviews
+    if (reviewResults) {
       result.reviews = [];
 
       for (const reviewResponse of reviewResults) {
@@ -291,42 +317,24 @@ export class CrawlOrchestrator {
       }
     }
 
-    // Fetch Reddit discussions
-    if (includeReddit && keywords && keywords.length > 0) {
-      const redditResponse = await this.crawlReddit({
-        keywords,
-        max_posts: maxRedditPosts,
-        max_comments_per_post: 10,
-        force_refresh: forceRefresh,
-      });
-
-      if (redditResponse && redditResponse.discussions.length > 0) {
-        const insights = this.extractRedditInsights(redditResponse);
-        const sentiment = this.analyzeRedditSentiment(redditResponse);
+    // Reddit discussions
+    if (redditResponse && redditResponse.discussions.length > 0) {
+      const insights = this.extractRedditInsights(redditResponse);
+      const sentiment = this.analyzeRedditSentiment(redditResponse);
 
-        result.reddit = {
-          totalDiscussions: redditResponse.total_posts,
-          discussions: redditResponse.discussions,
-          keyInsights: insights,
-          userSentiment: sentiment,
-        };
+      result.reddit = {
+        totalDiscussions: redditResponse.total_posts,
+        discussions: redditResponse.discussions,
+        keyInsights: insights,
+        userSentiment: sentiment,
+      };
 
-        // Format for prompt
-        enrichmentParts.push(this.formatRedditForPrompt(redditResponse, insights));
-      }
+      // Format for prompt
+      enrichmentParts.push(this.formatRedditForPrompt(redditResponse, insights));
     }
 
-    // Fetch website content
-    if (includeWebsites && competitorUrls && competitorUrls.length > 0) {
-      const websitePromises = competitorUrls.slice(0, 3).map(url =>
-        this.crawlWebsite({
-          url,
-          max_pages: 5,
-          force_refresh: forceRefresh,
-        })
-      );
-
-      const websiteResults = await Promise.all(websitePromises);
+    // Website content
+    if (websiteResults) {
       result.websites = [];
 
       for (const websiteResponse of websiteResults) {